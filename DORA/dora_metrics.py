@@ -1,13 +1,67 @@
 #!/usr/bin/env python3
 import argparse
+import bisect
+import concurrent.futures
 import datetime
+import functools
+import hashlib
+import heapq
+import json
 import os
+import pathlib
 import re
 import subprocess
 import sys
 import tempfile
 from collections import defaultdict
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
+
+
+# Compiled once; the hotfix/issue patterns ignore case instead of lower-casing every message
+_TAG_RE = re.compile(r"v?\d+\.\d+\.\d+|release-|deploy-|prod-")
+_HOTFIX_MSG_RE = re.compile(r"\b(fix|hotfix|bugfix|bug|issue|incident)\b", re.IGNORECASE)
+_HOTFIX_BRANCH_RE = re.compile(r"\b(hotfix|bugfix)\b", re.IGNORECASE)
+_ISSUE_RE = re.compile(r"(fix|resolve|close)\s+#(\d+)", re.IGNORECASE)
+
+
+# All repository commands are read-only: skip optional index/ref locks and
+# force the C locale and UTC so git never spends time on localisation
+_GIT_ENV_OVERRIDES = {"GIT_OPTIONAL_LOCKS": "0", "LC_ALL": "C", "TZ": "UTC"}
+
+# Based on 2021 DORA report performance levels: (bisect function, thresholds, levels).
+# Deployment frequency is higher-is-better ("at least" thresholds, bisect_right);
+# the others are lower-is-better ("at most" thresholds, bisect_left).
+_PERFORMANCE_THRESHOLDS = {
+    # Less than once per month / weekly-monthly / daily-weekly / multiple deploys per day
+    "deployment_frequency": (bisect.bisect_right, (1/30, 1/7, 1), ("Low", "Medium", "High", "Elite")),
+    # Less than one day / one week / one month / more than one month
+    "lead_time_for_changes": (bisect.bisect_left, (24, 168, 720), ("Elite", "High", "Medium", "Low")),
+    # 0-15% / 16-30% / 31-45% / 46-60%
+    "change_failure_rate": (bisect.bisect_left, (0.15, 0.30, 0.45), ("Elite", "High", "Medium", "Low")),
+    # Less than one day / one week / one month / more than one month
+    "time_to_restore": (bisect.bisect_left, (24, 168, 720), ("Elite", "High", "Medium", "Low")),
+}
+
+
+def determine_performance_level(metric_name: str, value: float) -> str:
+    """Return the DORA performance level (Elite/High/Medium/Low) for a metric value."""
+    if metric_name not in _PERFORMANCE_THRESHOLDS:
+        return "Unknown"
+    bisect_fn, thresholds, levels = _PERFORMANCE_THRESHOLDS[metric_name]
+    return levels[bisect_fn(thresholds, value)]
+
+
+METRIC_METHODS = {
+    "deployment_frequency": "get_deployment_frequency",
+    "lead_time_for_changes": "get_lead_time_for_changes",
+    "change_failure_rate": "get_change_failure_rate",
+    "time_to_restore": "get_time_to_restore",
+}
+
+
+def _calculate_metric(calculator: "DORAMetricsCalculator", metric_name: str) -> float:
+    """Calculate a single metric against an already cloned repository (process pool worker)."""
+    return getattr(calculator, METRIC_METHODS[metric_name])()
 
 
 class DORAMetricsCalculator:
@@ -17,144 +71,239 @@ class DORAMetricsCalculator:
         self.branch = branch
         self.temp_dir = temp_dir or tempfile.mkdtemp()
         self.repo_dir = os.path.join(self.temp_dir, "repo")
+        # Every git call runs with -C instead of changing the process working directory
+        self._git = ["git", "-C", self.repo_dir]
+        self._git_env = {**os.environ, **_GIT_ENV_OVERRIDES}
+        self.cache_dir = pathlib.Path(os.environ.get("DORA_CACHE", "~/.cache/dora")).expanduser()
         self.start_date = start_date
         self.end_date = end_date or datetime.datetime.now().strftime("%Y-%m-%d")
         
     def clone_repo(self) -> None:
         """Clone the repository to a temporary directory."""
         print(f"Cloning {self.repo_url} into {self.repo_dir}...")
-        subprocess.run(["git", "clone", self.repo_url, self.repo_dir], check=True)
-        
-    def get_date_range_args(self) -> List[str]:
+        # Only commit metadata is read, so clone bare (no checkout) and skip downloading
+        # file contents (partial clone). All branches are kept: hotfix branches feed
+        # the time to restore metric.
+        subprocess.run(["git", "clone", "--bare", "--filter=blob:none", self.repo_url, self.repo_dir], check=True)
+
+        # A commit-graph with changed-path Bloom filters lets every later git log
+        # walk read pre-parsed commits instead of decompressing them from packfiles
+        subprocess.run([*self._git, "config", "core.commitGraph", "true"], check=True)
+        subprocess.run([*self._git, "config", "gc.writeCommitGraph", "true"], check=True)
+        subprocess.run([*self._git, "commit-graph", "write", "--reachable",
+                        "--changed-paths", "--no-progress"], check=True)
+
+    def _cache_path(self, head: str) -> pathlib.Path:
+        """Return the metrics cache file for this repository, branch, date range and branch head."""
+        key = f"{self.repo_url}|{self.branch}|{self.start_date}|{self.end_date}|{head}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+    
+    def _load_cached_metrics(self, head: str) -> Optional[Dict[str, float]]:
+        """Return previously calculated metrics for this branch head, if any."""
+        try:
+            with open(self._cache_path(head)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cached_metrics(self, head: str, metrics: Dict[str, float]) -> None:
+        """Store calculated metrics; git history is append-only so the head identifies them."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_path(head), "w") as f:
+                json.dump(metrics, f)
+        except OSError as e:
+            print(f"Warning: could not write metrics cache: {e}")
+    
+    @functools.cached_property
+    def date_range_args(self) -> Tuple[str, ...]:
         """Return git log date range arguments based on provided dates."""
         args = []
         if self.start_date:
             args.extend(["--since", self.start_date])
         if self.end_date:
             args.extend(["--until", self.end_date])
-        return args
+        return tuple(args)
+    
+    @functools.cached_property
+    def _history(self) -> Dict[str, object]:
+        """
+        Scan the branch history once and collect what every metric needs:
+        merges as (sha, parents, timestamp), the number of hotfix-keyword commits
+        and the timestamp of the earliest commit fixing each referenced issue.
+        Only counters and matches are kept, never a list of every commit.
+        """
+        cmd = ["log", self.branch]
+        cmd.extend(self.date_range_args)
+        cmd.extend(["--pretty=format:%H|%P|%at|%s"])
+
+        merges = []
+        hotfix_count = 0
+        issue_fix_timestamps = {}
+        for line in self._git_lines(cmd):
+            fields = line.split("|", 3)
+            if len(fields) < 4:
+                continue
+            sha, parents, timestamp, subject = fields
+            # Only merges (more than one parent) need their parents and date parsed
+            if " " in parents:
+                merges.append((sha, tuple(parents.split()), int(timestamp)))
+            hotfix_count += bool(_HOTFIX_MSG_RE.search(subject))
+            issue_match = _ISSUE_RE.search(subject)
+            if issue_match:
+                # Newest first, so the last assignment is the earliest fix
+                issue_fix_timestamps[issue_match.group(2)] = int(timestamp)
+
+        return {"merges": tuple(merges), "hotfix_count": hotfix_count,
+                "issue_fix_timestamps": issue_fix_timestamps}
+    
+    def _run(self, *args: str) -> subprocess.CompletedProcess:
+        """Run a read-only git command in the repository and capture its output."""
+        return subprocess.run([*self._git, *args], check=False, capture_output=True, text=True,
+                              errors="replace", env=self._git_env)
+        
+    def _git_lines(self, args: List[str]) -> Iterator[str]:
+        """Yield the output of a git command line by line as it is produced."""
+        with subprocess.Popen([*self._git, *args], stdout=subprocess.PIPE, text=True,
+                              errors="replace", env=self._git_env) as proc:
+            for line in proc.stdout:
+                yield line.rstrip("\n")
         
     def get_deployment_frequency(self) -> float:
         """Calculate deployment frequency (deployments per day)."""
-        os.chdir(self.repo_dir)
-        
-        # Get all tags that look like releases or deployments
-        tag_pattern = r"v?\d+\.\d+\.\d+|release-|deploy-|prod-"
-        date_args = self.get_date_range_args()
-        
         # Get all tags with their dates
-        cmd = ["git", "log", "--tags", "--simplify-by-decoration", "--pretty=%ai %d"]
-        cmd.extend(date_args)
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        lines = result.stdout.strip().split("\n")
+        cmd = ["log", "--tags", "--simplify-by-decoration", "--pretty=%at %d"]
+        cmd.extend(self.date_range_args)
         
         # Count deployments based on tags
-        deployments = []
-        for line in lines:
-            if not line.strip():
-                continue
-            if re.search(tag_pattern, line):
-                date_str = line.split(" ")[0]
-                deployments.append(date_str)
+        deployments = 0
+        for line in self._git_lines(cmd):
+            if _TAG_RE.search(line):
+                deployments += 1
         
         # Calculate days in range
         if self.start_date:
-            start = datetime.datetime.strptime(self.start_date, "%Y-%m-%d")
+            start = datetime.datetime.fromisoformat(self.start_date)
         else:
-            # If no start date, use the date of the first commit
-            first_commit_cmd = ["git", "log", "--reverse", "--format=%ai", "-1"]
-            first_commit = subprocess.run(first_commit_cmd, capture_output=True, text=True).stdout.strip()
-            if first_commit:
-                start = datetime.datetime.strptime(first_commit.split(" ")[0], "%Y-%m-%d")
+            # If no start date, use the date of the first commit. The root commits are
+            # read straight off the commit graph; `log --reverse -1` would limit before
+            # reversing and return the newest commit instead.
+            root_commits = self._run("rev-list", "--max-parents=0", "--format=%at", self.branch).stdout
+            root_timestamps = [int(line) for line in root_commits.splitlines() if line.isdigit()]
+            if root_timestamps:
+                first_commit = datetime.datetime.fromtimestamp(min(root_timestamps), tz=datetime.timezone.utc)
+                start = first_commit.replace(tzinfo=None)
             else:
                 return 0
         
-        end = datetime.datetime.strptime(self.end_date, "%Y-%m-%d")
+        end = datetime.datetime.fromisoformat(self.end_date)
         days = (end - start).days or 1  # Avoid division by zero
         
         # If no deployment tags found, try to use merge commits to main as deployments
         if not deployments:
             print("No deployment tags found. Using merges to main branch as proxy...")
-            merge_cmd = ["git", "log", self.branch, "--merges"]
-            merge_cmd.extend(date_args)
-            merge_cmd.extend(["--pretty=%ai"])
-            
-            result = subprocess.run(merge_cmd, capture_output=True, text=True)
-            lines = result.stdout.strip().split("\n")
-            deployments = [line.split(" ")[0] for line in lines if line.strip()]
+            deployments = len(self._history["merges"])
         
-        return len(deployments) / days
+        return deployments / days
     
-    def get_lead_time_for_changes(self) -> float:
-        """Calculate lead time for changes (time from commit to deployment)."""
-        os.chdir(self.repo_dir)
+    @functools.cached_property
+    def _commit_graph(self) -> Dict[str, Tuple[int, int, Tuple[str, ...]]]:
+        """
+        Return sha -> (generation number, author timestamp, parents) for the whole branch.
+        A commit's generation is one more than its highest parent's, so unlike commit
+        dates it strictly decreases along every path into history.
+        """
+        # Topological order lists children before parents; walk it backwards to number them
+        rows = []
+        for line in self._git_lines(["log", self.branch, "--topo-order", "--pretty=format:%H %at %P"]):
+            fields = line.split()
+            if len(fields) >= 2:
+                rows.append((fields[0], int(fields[1]), tuple(fields[2:])))
         
-        # Get all tags that look like releases or deployments
-        date_args = self.get_date_range_args()
+        graph = {}
+        for sha, author_timestamp, parents in reversed(rows):
+            generation = 1 + max((graph[parent][0] for parent in parents if parent in graph), default=0)
+            graph[sha] = (generation, author_timestamp, parents)
+        return graph
+    
+    def _earliest_in_range(self, exclude: str, include: str) -> Optional[int]:
+        """
+        Return the earliest author timestamp among the commits in exclude..include.
+        Walks the cached commit graph from the highest generation down, the way git's
+        revision walk does: ancestors of exclude are painted uninteresting, and the walk
+        stops once only uninteresting commits are queued and all of them sit below every
+        remaining candidate, so none of them can lead back to one.
+        """
+        graph = self._commit_graph
+        if include not in graph or exclude not in graph:
+            return None
         
-        # This is complex without CI/CD data, so we'll use time between commit and merge to main as proxy
-        cmd = ["git", "log", self.branch, "--merges"]
-        cmd.extend(date_args)
-        cmd.extend(["--pretty=%H"])
+        uninteresting = set()
+        visited = set()
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        merge_commits = result.stdout.strip().split("\n")
+        def mark_uninteresting(sha):
+            stack = [sha]
+            while stack:
+                sha = stack.pop()
+                if sha in uninteresting:
+                    continue
+                uninteresting.add(sha)
+                # Parents of an already visited commit were queued as interesting; repaint them
+                if sha in visited:
+                    stack.extend(parent for parent in graph[sha][2] if parent in graph)
         
-        lead_times = []
-        for merge_commit in merge_commits:
-            if not merge_commit.strip():
-                continue
-                
-            # Get merge date
-            merge_date_cmd = ["git", "show", "-s", "--format=%ai", merge_commit]
-            merge_date_str = subprocess.run(merge_date_cmd, capture_output=True, text=True).stdout.strip()
-            merge_date = datetime.datetime.strptime(merge_date_str, "%Y-%m-%d %H:%M:%S %z")
-            
-            # Get the commits that were merged
-            parents_cmd = ["git", "log", merge_commit, "-n1", "--pretty=%P"]
-            parents = subprocess.run(parents_cmd, capture_output=True, text=True).stdout.strip().split()
-            
-            if len(parents) >= 2:  # It's a merge commit
-                # Get the earliest commit in the feature branch
-                feature_branch_base = parents[1]  # Usually the second parent is the feature branch
-                
-                commits_cmd = ["git", "log", f"{feature_branch_base}..{merge_commit}", "--pretty=%ai"]
-                commits = subprocess.run(commits_cmd, capture_output=True, text=True).stdout.strip().split("\n")
-                
-                if commits:
-                    earliest_commit_date_str = commits[-1].strip()
-                    if earliest_commit_date_str:
-                        earliest_commit_date = datetime.datetime.strptime(
-                            earliest_commit_date_str, "%Y-%m-%d %H:%M:%S %z")
-                        lead_time_hours = (merge_date - earliest_commit_date).total_seconds() / 3600
-                        lead_times.append(lead_time_hours)
+        mark_uninteresting(exclude)
+        queued = {include, exclude}
+        queue = [(-graph[include][0], include), (-graph[exclude][0], exclude)]
+        heapq.heapify(queue)
+        candidates = []
+        while queue:
+            if all(sha in uninteresting for _, sha in queue):
+                live = [graph[sha][0] for sha in candidates if sha not in uninteresting]
+                if not live or -queue[0][0] < min(live):
+                    break
+            _, sha = heapq.heappop(queue)
+            visited.add(sha)
+            is_uninteresting = sha in uninteresting
+            if not is_uninteresting:
+                candidates.append(sha)
+            for parent in graph[sha][2]:
+                if parent not in graph:  # History cut off (e.g. shallow clone)
+                    continue
+                if is_uninteresting:
+                    mark_uninteresting(parent)
+                if parent not in queued:
+                    queued.add(parent)
+                    heapq.heappush(queue, (-graph[parent][0], parent))
         
+        timestamps = [graph[sha][1] for sha in candidates if sha not in uninteresting]
+        return min(timestamps) if timestamps else None
+    
+    def get_lead_time_for_changes(self) -> float:
+        """Calculate lead time for changes (time from commit to deployment)."""
+        # This is complex without CI/CD data, so we'll use time between commit and merge to main as proxy
+        # All ranges are resolved against one streamed commit graph. Passing several
+        # A..B ranges to a single git log would not work: git unions all included and
+        # all excluded revisions instead of evaluating each range separately.
+        lead_times = []
+        for merge_commit, parents, merge_timestamp in self._history["merges"]:
+            # The first parent is the mainline, so mainline..merge holds the merged feature commits
+            earliest_timestamp = self._earliest_in_range(parents[0], merge_commit)
+
+            if earliest_timestamp is not None:
+                lead_time_hours = (merge_timestamp - earliest_timestamp) / 3600
+                lead_times.append(lead_time_hours)
+
         return sum(lead_times) / len(lead_times) if lead_times else 0
     
     def get_change_failure_rate(self) -> float:
         """Calculate change failure rate (percentage of deployments causing incidents)."""
-        os.chdir(self.repo_dir)
-        date_args = self.get_date_range_args()
-        
         # Without incident data, we'll use hotfix commits as proxy for failures
         # Count total deployments (merges to main)
-        merge_cmd = ["git", "log", self.branch, "--merges"]
-        merge_cmd.extend(date_args)
-        merge_cmd.extend(["--pretty=%H"])
-        
-        result = subprocess.run(merge_cmd, capture_output=True, text=True)
-        total_deployments = len([line for line in result.stdout.strip().split("\n") if line.strip()])
+        total_deployments = len(self._history["merges"])
         
         # Count hotfix commits (commits with "fix", "hotfix", "bugfix" in message)
-        hotfix_cmd = ["git", "log", self.branch]
-        hotfix_cmd.extend(date_args)
-        hotfix_cmd.extend(["--pretty=%s"])
-        
-        result = subprocess.run(hotfix_cmd, capture_output=True, text=True)
-        commit_msgs = result.stdout.strip().split("\n")
-        hotfix_pattern = r"\b(fix|hotfix|bugfix|bug|issue|incident)\b"
-        hotfixes = len([msg for msg in commit_msgs if re.search(hotfix_pattern, msg.lower())])
+        hotfixes = self._history["hotfix_count"]
         
         return (hotfixes / total_deployments) if total_deployments > 0 else 0
     
@@ -164,96 +313,48 @@ class DORAMetricsCalculator:
         This is hard to determine from git data alone, so we'll use time between
         hotfix branches and their merges as a proxy.
         """
-        os.chdir(self.repo_dir)
-        date_args = self.get_date_range_args()
-        
         # Look for hotfix branches and calculate time to merge
-        branch_cmd = ["git", "branch", "-r"]
-        result = subprocess.run(branch_cmd, capture_output=True, text=True)
-        branches = result.stdout.strip().split("\n")
+        # One ref listing gives every branch with the date of its tip commit
+        # (a bare clone mirrors the remote's branches as local heads)
+        refs_cmd = ["for-each-ref", "refs/heads", "--format=%(refname:short)|%(authordate:unix)"]
         
-        hotfix_pattern = r"\b(hotfix|bugfix)\b"
-        restore_times = []
-        
-        for branch in branches:
-            branch = branch.strip()
-            if not branch or not re.search(hotfix_pattern, branch.lower()):
-                continue
-                
-            # Get creation date (first commit in branch)
-            clean_branch = branch.replace("origin/", "")
-            first_commit_cmd = ["git", "log", "--reverse", clean_branch, "-1", "--pretty=%ai"]
-            first_commit_result = subprocess.run(first_commit_cmd, capture_output=True, text=True)
-            
-            if first_commit_result.returncode != 0:
-                continue
-                
-            first_commit_date_str = first_commit_result.stdout.strip()
-            if not first_commit_date_str:
+        hotfix_branches = {}
+        for ref in self._git_lines(refs_cmd):
+            branch, _, branch_timestamp = ref.rpartition("|")
+            if not branch or not branch_timestamp or not _HOTFIX_BRANCH_RE.search(branch):
                 continue
-                
-            first_commit_date = datetime.datetime.strptime(first_commit_date_str, "%Y-%m-%d %H:%M:%S %z")
-            
-            # Get merge date
-            merge_cmd = ["git", "log", self.branch, "--merges", f"--grep=Merge.*{clean_branch}", "-1", "--pretty=%ai"]
-            merge_result = subprocess.run(merge_cmd, capture_output=True, text=True)
+            hotfix_branches[branch] = int(branch_timestamp)
+        
+        restore_times = []
+        if hotfix_branches:
+            # One pass over the merges; git log lists them newest first. Every hotfix
+            # branch name contains "hotfix" or "bugfix", so let git drop the other merges
+            merge_cmd = ["log", self.branch, "--merges", "--regexp-ignore-case",
+                         "--grep=hotfix", "--grep=bugfix", "--pretty=%at|%s"]
+            merges = [line.split("|", 1) for line in self._git_lines(merge_cmd) if "|" in line]
             
-            if merge_result.returncode == 0 and merge_result.stdout.strip():
-                merge_date_str = merge_result.stdout.strip()
-                merge_date = datetime.datetime.strptime(merge_date_str, "%Y-%m-%d %H:%M:%S %z")
-                restore_time_hours = (merge_date - first_commit_date).total_seconds() / 3600
-                restore_times.append(restore_time_hours)
+            for hotfix_branch, branch_timestamp in hotfix_branches.items():
+                merge_pattern = re.compile(f"Merge.*{re.escape(hotfix_branch)}")
+                for merge_timestamp, subject in merges:
+                    if merge_pattern.search(subject):
+                        restore_time_hours = (int(merge_timestamp) - branch_timestamp) / 3600
+                        restore_times.append(restore_time_hours)
+                        break
         
         # If we can't find hotfix branches, try to use issue references in commit messages
         if not restore_times:
             print("No dedicated hotfix branches found. Using issue references as proxy...")
-            issue_pattern = r"(fix|resolve|close)\s+#(\d+)"
-            
-            # Get all commits that mention fixing issues
-            issue_cmd = ["git", "log", self.branch]
-            issue_cmd.extend(date_args)
-            issue_cmd.extend(["--pretty=%H %s"])
-            
-            result = subprocess.run(issue_cmd, capture_output=True, text=True)
-            commits = result.stdout.strip().split("\n")
-            
-            issue_to_fix_commit = {}
-            for commit in commits:
-                if not commit.strip():
-                    continue
-                    
-                parts = commit.split(" ", 1)
-                if len(parts) < 2:
-                    continue
-                    
-                commit_hash, message = parts
-                match = re.search(issue_pattern, message.lower())
-                
-                if match:
-                    issue_num = match.group(2)
-                    issue_to_fix_commit[issue_num] = commit_hash
             
             # For each fixed issue, try to find when it was created
-            for issue_num, fix_commit_hash in issue_to_fix_commit.items():
-                # Get fix date
-                fix_date_cmd = ["git", "show", "-s", "--format=%ai", fix_commit_hash]
-                fix_date_str = subprocess.run(fix_date_cmd, capture_output=True, text=True).stdout.strip()
-                
-                if not fix_date_str:
-                    continue
-                    
-                fix_date = datetime.datetime.strptime(fix_date_str, "%Y-%m-%d %H:%M:%S %z")
-                
+            for issue_num, fix_timestamp in self._history["issue_fix_timestamps"].items():
                 # Search for the commit that might have created the issue (mentioning the issue number)
-                issue_create_cmd = ["git", "log", self.branch, f"--grep=#{issue_num}", "--pretty=%ai", "-1"]
-                create_result = subprocess.run(issue_create_cmd, capture_output=True, text=True)
+                create_result = self._run("log", self.branch, f"--grep=#{issue_num}", "--pretty=%at", "-1")
                 
                 if create_result.returncode == 0 and create_result.stdout.strip():
-                    create_date_str = create_result.stdout.strip()
-                    create_date = datetime.datetime.strptime(create_date_str, "%Y-%m-%d %H:%M:%S %z")
+                    create_timestamp = int(create_result.stdout)
                     
-                    if create_date < fix_date:  # Ensure creation is before fix
-                        restore_time_hours = (fix_date - create_date).total_seconds() / 3600
+                    if create_timestamp < fix_timestamp:  # Ensure creation is before fix
+                        restore_time_hours = (fix_timestamp - create_timestamp) / 3600
                         restore_times.append(restore_time_hours)
         
         return sum(restore_times) / len(restore_times) if restore_times else 0
@@ -261,15 +362,37 @@ class DORAMetricsCalculator:
     def calculate_metrics(self) -> Dict[str, float]:
         """Calculate all DORA metrics."""
         try:
+            # Ask the remote for the branch head first so a cache hit skips the clone
+            ls_remote = subprocess.run(["git", "ls-remote", self.repo_url, f"refs/heads/{self.branch}"],
+                                       capture_output=True, text=True)
+            head = ls_remote.stdout.split()[0] if ls_remote.returncode == 0 and ls_remote.stdout.strip() else None
+            if head:
+                cached_metrics = self._load_cached_metrics(head)
+                if cached_metrics is not None:
+                    print(f"Using cached metrics for {self.branch} at {head}")
+                    return cached_metrics
+            
             self.clone_repo()
+            head = self._run("rev-parse", self.branch).stdout.strip() or head
             
-            metrics = {
-                "deployment_frequency": self.get_deployment_frequency(),
-                "lead_time_for_changes": self.get_lead_time_for_changes(),
-                "change_failure_rate": self.get_change_failure_rate(),
-                "time_to_restore": self.get_time_to_restore()
-            }
+            # Warm the shared history scan once; it is pickled along with
+            # the calculator so every worker reuses it instead of re-running git log
+            self._history
             
+            # Each metric is an independent git pipeline, so run them side by side
+            metrics = {}
+            with concurrent.futures.ProcessPoolExecutor(max_workers=len(METRIC_METHODS)) as executor:
+                futures = {
+                    executor.submit(_calculate_metric, self, metric_name): metric_name
+                    for metric_name in METRIC_METHODS
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    metrics[futures[future]] = future.result()
+            
+            # Keep the report order stable regardless of completion order
+            metrics = {metric_name: metrics[metric_name] for metric_name in METRIC_METHODS}
+            if head:
+                self._save_cached_metrics(head, metrics)
             return metrics
         except Exception as e:
             print(f"Error calculating metrics: {e}")
@@ -282,46 +405,6 @@ class DORAMetricsCalculator:
     
     def generate_report(self, metrics: Dict[str, float]) -> str:
         """Generate a human-readable report of the DORA metrics."""
-        def determine_performance_level(metric_name, value):
-            # Based on 2021 DORA report performance levels
-            if metric_name == "deployment_frequency":
-                if value >= 1:  # Multiple deploys per day
-                    return "Elite"
-                elif value >= 1/7:  # Between once per day and once per week
-                    return "High"
-                elif value >= 1/30:  # Between once per week and once per month
-                    return "Medium"
-                else:  # Less than once per month
-                    return "Low"
-            elif metric_name == "lead_time_for_changes":
-                if value <= 24:  # Less than one day
-                    return "Elite"
-                elif value <= 168:  # Less than one week
-                    return "High"
-                elif value <= 720:  # Less than one month
-                    return "Medium"
-                else:  # More than one month
-                    return "Low"
-            elif metric_name == "change_failure_rate":
-                if value <= 0.15:  # 0-15%
-                    return "Elite"
-                elif value <= 0.30:  # 16-30%
-                    return "High"
-                elif value <= 0.45:  # 31-45%
-                    return "Medium"
-                else:  # 46-60%
-                    return "Low"
-            elif metric_name == "time_to_restore":
-                if value <= 24:  # Less than one day
-                    return "Elite"
-                elif value <= 168:  # Less than one week
-                    return "High"
-                elif value <= 720:  # Less than one month
-                    return "Medium"
-                else:  # More than one month
-                    return "Low"
-            return "Unknown"
-        
         report = """
 DORA Metrics Report
 ==================
@@ -382,7 +465,6 @@ def main():
     metrics = calculator.calculate_metrics()
     
     if args.json:
-        import json
         print(json.dumps(metrics, indent=2))
     else:
         print(calculator.generate_report(metrics))
@@ -8,6 +8,8 @@ files that tend to change together (change coupling or temporal coupling).
 Usage:
   change_coupling.py --repo URL [--branch BRANCH] [--since DAYS] [--coupling-threshold PERCENT]
                     [--min-changes N] [--output FORMAT] [--output-file FILE] [--top N] [--ignore-file FILE]
+                    [--max-count N] [--first-parent] [--max-files-per-commit N] [--cache-dir DIR] [--no-cache]
+                    [--include-merges] [--include-deletions]
   change_coupling.py -h | --help
 
 Options:
@@ -20,31 +22,222 @@ Options:
   --output-file FILE           File to save CSV results [default: change_coupling_results.csv]
   --top N                      Show top N results with highest coupling [default: 20]
   --ignore-file FILE           Path to file containing patterns of files to ignore
+  --max-count N                Only consider the N most recent commits within the period
+  --first-parent               Only analyze commits made directly on the branch, skipping merged-in history
+  --max-files-per-commit N     Count no pairs for commits touching more than N source files, 0 for no limit [default: 50]
+  --cache-dir DIR              Directory for the parsed history cache [default: ~/.cache/change_coupling]
+  --no-cache                   Always clone and parse the history, without reading or writing the cache
+  --include-merges             Also analyze merge commits, diffed against their first parent
+  --include-deletions          Also count changes that delete a file
   -h --help                    Show this help message
 """
 
 import argparse
 import os
+import shutil
 import sys
 import tempfile
 import subprocess
 import datetime
 import json
+import math
+import operator
 import csv
 import fnmatch
+import hashlib
+import pickle
 import re
-from collections import defaultdict
-from typing import Dict, List, Tuple, Set, Optional
+from array import array
+from collections import Counter
+from itertools import combinations
+from typing import Dict, Iterator, List, Tuple, Set, Optional
+
+# Automatically exclude common configuration files
+CONFIG_FILE_SUFFIXES = (
+    '.eslintrc.js', '.eslintrc.json', '.eslintrc.yml', '.eslintrc',
+    '.prettierrc.js', '.prettierrc.json', '.prettierrc.yml', '.prettierrc',
+    '.babelrc', '.editorconfig', '.gitignore', '.travis.yml', '.gitlab-ci.yml',
+    'package.json', 'package-lock.json', 'yarn.lock', 'tsconfig.json'
+)
+
+# Add or remove extensions as needed for your project
+SOURCE_EXTENSIONS = frozenset({
+    '.py', '.java', '.js', '.jsx', '.ts', '.tsx', '.c', '.cpp', '.h', '.hpp',
+    '.cs', '.go', '.rb', '.php', '.swift', '.kt', '.rs', '.scala', '.sh',
+    '.html', '.css', '.scss', '.sql', '.xml', '.json', '.yaml', '.yml'
+})
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import scipy.sparse
+except ImportError:
+    scipy = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _pair_keys_kernel(offsets, ids, key_offsets, keys):
+        """Write the pair keys of every commit in parallel, one commit per iteration."""
+        for c in prange(len(offsets) - 1):
+            k = key_offsets[c]
+            for a in range(offsets[c], offsets[c + 1]):
+                for b in range(a + 1, offsets[c + 1]):
+                    low = min(ids[a], ids[b])
+                    high = max(ids[a], ids[b])
+                    keys[k] = (low << 32) | high
+                    k += 1
+
+
+def _pair_keys(offsets: "np.ndarray", ids: "np.ndarray") -> "np.ndarray":
+    """
+    Encode every unordered file id pair of each commit as one int64 key.
+    
+    Commits are given CSR-style: the ids of commit c are ids[offsets[c]:offsets[c + 1]].
+    The smaller id of each pair goes in the high 32 bits.
+    """
+    sizes = np.diff(offsets)
+    key_offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes * (sizes - 1) // 2, out=key_offsets[1:])
+    keys = np.empty(key_offsets[-1], dtype=np.int64)
+    
+    if njit is not None:
+        _pair_keys_kernel(offsets, ids, key_offsets, keys)
+        return keys
+    
+    for c in range(len(sizes)):
+        commit_ids = ids[offsets[c]:offsets[c + 1]]
+        i, j = np.triu_indices(len(commit_ids), k=1)
+        low = np.minimum(commit_ids[i], commit_ids[j])
+        high = np.maximum(commit_ids[i], commit_ids[j])
+        keys[key_offsets[c]:key_offsets[c + 1]] = (low << 32) | high
+    return keys
+
+
+def _pair_counts_sparse(offsets: "np.ndarray", ids: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Count the file id pairs of a CSR batch of commits with one sparse matrix product.
+    
+    With M the commit x file incidence matrix, the strict upper triangle of M.T @ M holds the
+    co-change count of every pair, so pairs are aggregated in compiled code rather than sorted.
+    Returns the pair keys in the same encoding as _pair_keys together with their counts.
+    """
+    commits = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    incidence = scipy.sparse.csr_matrix(
+        (np.ones(len(ids), dtype=np.int64), (commits, ids)),
+        shape=(len(offsets) - 1, int(ids.max()) + 1)
+    )
+    co_changes = scipy.sparse.triu(incidence.T @ incidence, k=1).tocoo()
+    keys = (co_changes.row.astype(np.int64) << 32) | co_changes.col.astype(np.int64)
+    return keys, co_changes.data.astype(np.int64)
+
+
+class _PairCounter:
+    """
+    Count how often each pair of file ids changes together, in NumPy batches when available.
+    
+    NumPy batches key a pair by a single int, (smaller id << 32) | larger id;
+    the pure-Python fallback keys it by the (smaller id, larger id) tuple.
+    """
+    
+    # Number of buffered pairs that triggers folding them into the running counts
+    FLUSH_PAIRS = 1 << 22
+    
+    def __init__(self):
+        """Initialize empty pair counts."""
+        if np is None:
+            self._pairs = Counter()
+            return
+        self._keys = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._ids = array('q')
+        self._offsets = array('q', [0])
+        self._pending_pairs = 0
+    
+    def add(self, ids: List[int]):
+        """Count every pair of the given file ids as one co-change."""
+        if len(ids) < 2:
+            return
+        if np is None:
+            # Sorting once makes every generated tuple canonical
+            self._pairs.update(combinations(sorted(ids), 2))
+            return
+        
+        # Buffer the commit's ids; pair keys are generated for the whole batch at flush time
+        self._ids.extend(ids)
+        self._offsets.append(len(self._ids))
+        self._pending_pairs += len(ids) * (len(ids) - 1) // 2
+        if self._pending_pairs >= self.FLUSH_PAIRS:
+            self._flush()
+    
+    def _flush(self):
+        """Fold the buffered commits' pair counts into the running counts."""
+        if not self._pending_pairs:
+            return
+        offsets = np.array(self._offsets, dtype=np.int64)
+        ids = np.array(self._ids, dtype=np.int64)
+        if scipy is not None:
+            keys, counts = _pair_counts_sparse(offsets, ids)
+        else:
+            keys = _pair_keys(offsets, ids)
+            counts = np.ones(len(keys), dtype=np.int64)
+        keys = np.concatenate([self._keys, keys])
+        counts = np.concatenate([self._counts, counts])
+        self._keys, inverse = np.unique(keys, return_inverse=True)
+        self._counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        self._ids = array('q')
+        self._offsets = array('q', [0])
+        self._pending_pairs = 0
+    
+    def arrays(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Return (id1, id2, count) arrays for every pair that changed together (NumPy only)."""
+        self._flush()
+        return self._keys >> 32, self._keys & 0xFFFFFFFF, self._counts
+    
+    def items(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (id1, id2, count) for every pair that changed together."""
+        if np is None:
+            for (id1, id2), count in self._pairs.items():
+                yield id1, id2, count
+            return
+        self._flush()
+        for key, count in zip(self._keys.tolist(), self._counts.tolist()):
+            yield key >> 32, key & 0xFFFFFFFF, count
 
 
 class GitChangeAnalyzer:
-    def __init__(self, repo_url: str, branch: str = "main", since_days: int = 90, ignore_file: Optional[str] = None):
-        """Initialize the analyzer with repository details."""
+    def __init__(self, repo_url: str, branch: str = "main", since_days: int = 90, ignore_file: Optional[str] = None,
+                 first_parent: bool = False, max_count: Optional[int] = None, cache_dir: Optional[str] = None,
+                 include_merges: bool = False, include_deletions: bool = False):
+        """Initialize the analyzer with repository details; cache_dir=None disables the history cache."""
         self.repo_url = repo_url
         self.branch = branch
         self.since_days = since_days
+        self.first_parent = first_parent
+        self.max_count = max_count
+        self.include_merges = include_merges
+        self.include_deletions = include_deletions
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
         self.temp_dir = None
         self.ignore_patterns = []
+        self._ignore_re = None
+        self._accept_cache = {}
+        
+        # Interned file names: name -> id and id -> name
+        self._file_id = {}
+        self._file_names = []
+        
+        # Counts from the last analyze_coupling run, kept for coupling_matrix()
+        self._file_change_count = Counter()
+        self._file_coupling = None
         
         # Load ignore patterns if specified
         if ignore_file and os.path.exists(ignore_file):
@@ -58,141 +251,361 @@ class GitChangeAnalyzer:
                 line = line.strip()
                 if line and not line.startswith('#'):
                     self.ignore_patterns.append(line)
+        
+        # Union every pattern into one compiled regex so each path is matched in a single pass
+        if self.ignore_patterns:
+            self._ignore_re = re.compile(
+                '|'.join(f"(?:{self._translate_pattern(pattern)})" for pattern in self.ignore_patterns)
+            )
         print(f"Loaded {len(self.ignore_patterns)} ignore patterns from {ignore_file_path}")
     
     def _should_ignore(self, file_path: str) -> bool:
         """Check if a file should be ignored based on ignore patterns."""
-        if not self.ignore_patterns:
+        if self._ignore_re is None:
             return False
-            
+        
         # Convert file_path to use forward slashes for consistent matching
-        file_path = file_path.replace('\\', '/')
+        return self._ignore_re.fullmatch(file_path.replace('\\', '/')) is not None
+    
+    @staticmethod
+    def _translate_pattern(pattern: str) -> str:
+        """Translate an ignore pattern to a regex; ** spans any number of directories."""
+        # Standard glob patterns
+        if '**' not in pattern:
+            return fnmatch.translate(pattern)
         
-        for pattern in self.ignore_patterns:
-            # Handle glob patterns (with ** for directories)
-            if '**' in pattern:
-                # Convert glob pattern to regex
-                regex_pattern = pattern.replace('.', '\\.').replace('**', '.*').replace('*', '[^/]*')
-                if re.match(f"^{regex_pattern}$", file_path):
-                    return True
-            # Standard glob patterns
-            elif fnmatch.fnmatch(file_path, pattern):
-                return True
-        return False
+        parts = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                parts.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                parts.append('[^/]')
+                i += 1
+            else:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+        return ''.join(parts)
         
     def clone_repository(self) -> str:
         """Clone the repository to a temporary directory and return the path."""
         print(f"Cloning repository {self.repo_url}...")
-        self.temp_dir = tempfile.mkdtemp()
-        subprocess.run(
-            ["git", "clone", "--single-branch", "--branch", self.branch, self.repo_url, self.temp_dir],
+        # CCOUPLING_TMPDIR can point the clone at faster storage (e.g. tmpfs); $TMPDIR is used otherwise
+        self.temp_dir = tempfile.mkdtemp(prefix="ccoupling-", dir=os.environ.get("CCOUPLING_TMPDIR"))
+        # Only commit metadata and name-only diffs are read, so skip blobs and the working tree
+        clone_cmd = ["git", "clone", "--bare", "--single-branch", "--branch", self.branch, "--filter=blob:none"]
+        try:
+            # Fetch only the analyzed window, then deepen by one commit so the oldest commits
+            # in it keep the parents their changed files are diffed against
+            subprocess.run(
+                clone_cmd + [f"--shallow-since={self._since_date()}", self.repo_url, self.temp_dir],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            subprocess.run(
+                ["git", "fetch", "--deepen=1", "origin", self.branch],
+                cwd=self.temp_dir,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except subprocess.CalledProcessError:
+            # The server refuses a shallow clone when no commit falls inside the window
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            subprocess.run(
+                clone_cmd + [self.repo_url, self.temp_dir],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        
+        # Index the history once so the log walk reads the commit-graph instead of raw commit objects;
+        # git ignores the commit-graph in shallow repositories, so only write it for complete ones
+        is_shallow = subprocess.run(
+            ["git", "rev-parse", "--is-shallow-repository"],
+            cwd=self.temp_dir,
             check=True,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+            text=True
+        ).stdout.strip()
+        if is_shallow != "true":
+            subprocess.run(
+                ["git", "commit-graph", "write", "--reachable", "--changed-paths"],
+                cwd=self.temp_dir,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
         return self.temp_dir
     
-    def get_commit_history(self) -> List[str]:
-        """Get the commit history for the specified time period."""
-        since_date = (datetime.datetime.now() - datetime.timedelta(days=self.since_days)).strftime("%Y-%m-%d")
+    def _since_date(self) -> str:
+        """Return the start of the analyzed period as YYYY-MM-DD."""
+        return (datetime.datetime.now() - datetime.timedelta(days=self.since_days)).strftime("%Y-%m-%d")
+    
+    def iter_commits_with_files(self) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Yield (commit hash, changed source files) for every commit in the time period.
         
-        result = subprocess.run(
-            ["git", "log", f"--since={since_date}", "--format=%H"],
+        A single streamed `git log --name-only` replaces one `git diff-tree` process per commit.
+        """
+        for commit_hash, raw_names in self._iter_history():
+            # Skip non-source files and ignored files
+            files = []
+            for raw_name in raw_names:
+                filename = self._accepted_name(raw_name)
+                if filename is not None:
+                    files.append(filename)
+            yield commit_hash, files
+    
+    def _iter_history(self) -> Iterator[Tuple[str, List[bytes]]]:
+        """
+        Yield (commit hash, raw changed paths) from the history cache, or clone and record it.
+        
+        The cache holds every changed path, unfiltered, so ignore patterns can change between runs.
+        """
+        if not self.cache_dir:
+            self.clone_repository()
+            yield from self._git_log_history()
+            return
+        
+        head = self._remote_head()
+        if head:
+            history = self._load_cached_history(head)
+            if history is not None:
+                print(f"Using cached history for {head[:12]}")
+                paths = history['paths']
+                hashes = history['hashes']
+                offsets = history['offsets']
+                ids = history['ids']
+                for i, commit_hash in enumerate(hashes):
+                    yield commit_hash, [paths[j] for j in ids[offsets[i]:offsets[i + 1]]]
+                return
+        
+        self.clone_repository()
+        # Key by the cloned HEAD so a push between ls-remote and the clone cannot poison the cache
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
             cwd=self.temp_dir,
             check=True,
             stdout=subprocess.PIPE,
             text=True
-        )
+        ).stdout.strip()
+        
+        # Paths are interned and commits stored as runs of path ids, like _PairCounter batches
+        path_ids = {}
+        hashes = []
+        offsets = array('q', [0])
+        ids = array('q')
+        for commit_hash, raw_names in self._git_log_history():
+            hashes.append(commit_hash)
+            for raw_name in raw_names:
+                path_id = path_ids.get(raw_name)
+                if path_id is None:
+                    path_id = path_ids[raw_name] = len(path_ids)
+                ids.append(path_id)
+            offsets.append(len(ids))
+            yield commit_hash, raw_names
         
-        commits = result.stdout.strip().split('\n')
-        # Filter out empty strings in case there are no commits
-        return [commit for commit in commits if commit]
-    
-    def get_changed_files(self, commit_hash: str) -> List[str]:
-        """Get the list of files changed in a specific commit."""
-        result = subprocess.run(
-            ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", commit_hash],
+        self._save_cached_history(head, {
+            'head': head,
+            'paths': list(path_ids),
+            'hashes': hashes,
+            'offsets': offsets,
+            'ids': ids,
+        })
+    
+    def _log_args(self) -> List[str]:
+        """Return the `git log` options selecting the analyzed commits and changes."""
+        log_args = [f"--since={self._since_date()}"]
+        if self.max_count:
+            log_args.append(f"--max-count={self.max_count}")
+        if self.first_parent:
+            log_args.append("--first-parent")
+        # Merges touch every file of the merged branch and deleted files can never change again,
+        # so by default git drops both while diffing instead of handing them to the pair counting
+        if self.include_merges:
+            # Without this git log shows no files for merges at all
+            log_args.append("--diff-merges=first-parent")
+        else:
+            log_args.append("--no-merges")
+        if not self.include_deletions:
+            log_args.append("--diff-filter=AM")
+        return log_args
+    
+    def _git_log_history(self) -> Iterator[Tuple[str, List[bytes]]]:
+        """Stream (commit hash, raw changed paths) from `git log` in the cloned repository."""
+        # With -z every field is NUL-terminated: a commit is an empty field (the %x00 marker), its hash,
+        # then its file names, the first of which carries a leading newline. Like `git diff-tree`
+        # without --root, the initial commit contributes no files.
+        # Rename detection is disabled because it would fetch blobs missing from the partial clone.
+        with subprocess.Popen(
+            ["git", "-c", "core.commitGraph=true", "-c", "log.showRoot=false", "log", *self._log_args(),
+             "-z", "--name-only", "--no-renames", "--format=%x00%H"],
             cwd=self.temp_dir,
-            check=True,
-            stdout=subprocess.PIPE,
-            text=True
-        )
+            stdout=subprocess.PIPE
+        ) as proc:
+            commit_hash = None
+            files = []
+            expect_hash = False
+            first_file = False
+            partial = b''
+            for chunk in iter(lambda: proc.stdout.read1(1 << 16), b''):
+                fields = (partial + chunk).split(b'\x00')
+                # The last field is incomplete until the next chunk arrives
+                partial = fields.pop()
+                for field in fields:
+                    if not field:
+                        expect_hash = True
+                    elif expect_hash:
+                        if commit_hash:
+                            yield commit_hash, files
+                        commit_hash = field.decode('ascii')
+                        files = []
+                        expect_hash = False
+                        first_file = True
+                    else:
+                        if first_file:
+                            field = field[1:]
+                            first_file = False
+                        files.append(field)
+            if commit_hash:
+                yield commit_hash, files
         
-        files = result.stdout.strip().split('\n')
-        # Filter out empty strings, non-source files, and ignored files
-        return [file for file in files if file and self._is_source_file(file) and not self._should_ignore(file)]
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    
+    def _remote_head(self) -> Optional[str]:
+        """Return the commit the remote branch points at, or None if it cannot be determined."""
+        try:
+            output = subprocess.run(
+                ["git", "ls-remote", self.repo_url, f"refs/heads/{self.branch}"],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            ).stdout
+        except subprocess.CalledProcessError:
+            return None
+        return output.split()[0] if output.strip() else None
+    
+    def _cache_path(self, head: str) -> str:
+        """Return the cache file for this repository, branch, HEAD and log selection."""
+        key = "|".join([self.repo_url, self.branch, head, *self._log_args()])
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".pkl")
+    
+    def _load_cached_history(self, head: str) -> Optional[Dict]:
+        """Load the recorded history for head, or None on a cache miss."""
+        try:
+            with open(self._cache_path(head), 'rb') as f:
+                history = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            return None
+        return history if history.get('head') == head else None
+    
+    def _save_cached_history(self, head: str, history: Dict):
+        """Write the recorded history for head; failures only cost the next run a clone."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._cache_path(head), 'wb') as f:
+                pickle.dump(history, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Warning: could not write history cache: {e}", file=sys.stderr)
+    
+    def _accepted_name(self, raw_name: bytes) -> Optional[str]:
+        """Decode a path from git output if it is an analyzed source file, else None; each distinct path is checked once."""
+        try:
+            return self._accept_cache[raw_name]
+        except KeyError:
+            filename = os.fsdecode(raw_name)
+            if not self._is_source_file(filename) or self._should_ignore(filename):
+                filename = None
+            self._accept_cache[raw_name] = filename
+            return filename
+    
+    def _intern(self, filename: str) -> int:
+        """Return the integer id for a file name, assigning the next id on first sight."""
+        file_id = self._file_id.get(filename)
+        if file_id is None:
+            file_id = self._file_id[filename] = len(self._file_names)
+            self._file_names.append(filename)
+        return file_id
     
     def _is_source_file(self, filename: str) -> bool:
         """Check if a file is a source code file (exclude binaries, images, etc.)."""
+        if filename.endswith(CONFIG_FILE_SUFFIXES):
+            return False
         _, ext = os.path.splitext(filename)
-        
-        # Automatically exclude common configuration files
-        config_patterns = [
-            '.eslintrc.js', '.eslintrc.json', '.eslintrc.yml', '.eslintrc',
-            '.prettierrc.js', '.prettierrc.json', '.prettierrc.yml', '.prettierrc',
-            '.babelrc', '.editorconfig', '.gitignore', '.travis.yml', '.gitlab-ci.yml',
-            'package.json', 'package-lock.json', 'yarn.lock', 'tsconfig.json'
-        ]
-        
-        for pattern in config_patterns:
-            if filename.endswith(pattern):
-                return False
-        
-        # Add or remove extensions as needed for your project
-        source_extensions = {
-            '.py', '.java', '.js', '.jsx', '.ts', '.tsx', '.c', '.cpp', '.h', '.hpp',
-            '.cs', '.go', '.rb', '.php', '.swift', '.kt', '.rs', '.scala', '.sh',
-            '.html', '.css', '.scss', '.sql', '.xml', '.json', '.yaml', '.yml'
-        }
-        return ext.lower() in source_extensions
-    
-    def analyze_coupling(self, min_coupling_percent: int = 30, min_changes: int = 3) -> List[Dict]:
+        return ext.lower() in SOURCE_EXTENSIONS
+    
+    def analyze_coupling(self, min_coupling_percent: int = 30, min_changes: int = 3,
+                         max_files_per_commit: int = 50) -> List[Dict]:
         """
         Analyze the repository for change coupling.
         
         Args:
             min_coupling_percent: Minimum coupling percentage to report
             min_changes: Minimum number of changes required for a file to be considered
+            max_files_per_commit: Leave commits touching more source files than this out of the pair counts (0 for no limit)
             
         Returns:
             List of dictionaries with coupling information
         """
         try:
-            repo_path = self.clone_repository()
-            commits = self.get_commit_history()
-            
-            if not commits:
-                print("No commits found in the specified time period.")
-                return []
-            
-            print(f"Analyzing {len(commits)} commits...")
+            print("Analyzing commits...")
+            commit_count = 0
+            skipped_count = 0
             
             # Track how many times each file was changed
-            file_change_count = defaultdict(int)
+            file_change_count = self._file_change_count = Counter()
             
             # Track how many times each pair of files changed together
-            file_coupling = defaultdict(int)
+            file_coupling = self._file_coupling = _PairCounter()
             
-            # Process each commit
-            for commit in commits:
-                changed_files = self.get_changed_files(commit)
+            # Process each commit as git log streams it
+            for commit, changed_files in self.iter_commits_with_files():
+                commit_count += 1
+                
+                ids = [self._intern(file) for file in changed_files]
                 
                 # Update file change counts
-                for file in changed_files:
-                    file_change_count[file] += 1
+                file_change_count.update(ids)
+                
+                # Bulk commits (imports, vendoring, mass renames) add quadratic work and no coupling signal,
+                # so they count as changes to each file but not as co-changes
+                if max_files_per_commit and len(ids) > max_files_per_commit:
+                    skipped_count += 1
+                    continue
                 
                 # Update coupling for each pair of files
-                for i, file1 in enumerate(changed_files):
-                    for file2 in changed_files[i+1:]:
-                        # Create a sorted tuple to ensure consistent keys
-                        pair = tuple(sorted([file1, file2]))
-                        file_coupling[pair] += 1
+                file_coupling.add(ids)
+            
+            if not commit_count:
+                print("No commits found in the specified time period.")
+                return []
+            
+            print(f"Analyzed {commit_count} commits.")
+            if skipped_count:
+                print(f"Skipped pairs for {skipped_count} commits touching more than {max_files_per_commit} files.")
             
             # Calculate coupling percentages and weighted scores
+            if np is not None:
+                return self._score_pairs_numpy(file_coupling, file_change_count, min_coupling_percent, min_changes)
+            
             results = []
-            for (file1, file2), coupled_count in file_coupling.items():
-                file1_count = file_change_count[file1]
-                file2_count = file_change_count[file2]
+            for id1, id2, coupled_count in file_coupling.items():
+                file1, file2 = self._file_names[id1], self._file_names[id2]
+                file1_count = file_change_count[id1]
+                file2_count = file_change_count[id2]
+                if file2 < file1:
+                    file1, file2, file1_count, file2_count = file2, file1, file2_count, file1_count
                 
                 # Skip files with too few changes
                 if file1_count < min_changes or file2_count < min_changes:
@@ -210,8 +623,7 @@ class GitChangeAnalyzer:
                 if coupling_percent >= min_coupling_percent:
                     # Calculate weighted score: coupling_percent * log(changes_together + 1)
                     # This balances high coupling percentage with frequency of changes
-                    import math
-                    weighted_score = coupling_percent * math.log(coupled_count + 1)
+                    weighted_score = coupling_percent * math.log1p(coupled_count)
                     
                     results.append({
                         'file1': file1,
@@ -223,19 +635,86 @@ class GitChangeAnalyzer:
                         'weighted_score': round(weighted_score, 2)
                     })
             
-            # Sort by weighted score (descending)
-            results.sort(key=lambda x: x['weighted_score'], reverse=True)
+            # Sort by weighted score (descending), breaking ties by file names
+            results.sort(key=lambda x: (-x['weighted_score'], x['file1'], x['file2']))
             return results
             
         finally:
             # Clean up temporary directory
             if self.temp_dir and os.path.exists(self.temp_dir):
-                subprocess.run(["rm", "-rf", self.temp_dir], check=True)
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _score_pairs_numpy(self, file_coupling: _PairCounter, file_change_count: Counter,
+                           min_coupling_percent: int, min_changes: int) -> List[Dict]:
+        """Vectorized form of the scoring loop in analyze_coupling, computed over a structured array."""
+        id1, id2, together = file_coupling.arrays()
+        changes = np.zeros(len(self._file_names), dtype=np.int64)
+        changes[list(file_change_count)] = list(file_change_count.values())
+        
+        # Order each pair by file name so that file1 < file2
+        rank = np.empty(len(self._file_names), dtype=np.int64)
+        rank[sorted(range(len(self._file_names)), key=self._file_names.__getitem__)] = np.arange(len(self._file_names))
+        swap = rank[id1] > rank[id2]
+        
+        rows = np.zeros(len(together), dtype=[
+            ('id1', 'i4'), ('id2', 'i4'), ('coupling', 'f8'), ('together', 'i8'),
+            ('c1', 'i8'), ('c2', 'i8'), ('score', 'f8')
+        ])
+        rows['id1'] = np.where(swap, id2, id1)
+        rows['id2'] = np.where(swap, id1, id2)
+        rows['together'] = together
+        rows['c1'] = changes[rows['id1']]
+        rows['c2'] = changes[rows['id2']]
+        
+        # Skip files with too few changes, then keep coupling above the threshold
+        rows = rows[(rows['c1'] >= min_changes) & (rows['c2'] >= min_changes)]
+        rows['coupling'] = np.minimum(np.round(rows['together'] / rows['c1'] * 100, 2),
+                                      np.round(rows['together'] / rows['c2'] * 100, 2))
+        rows = rows[rows['coupling'] >= min_coupling_percent]
+        rows['score'] = np.round(rows['coupling'] * np.log1p(rows['together']), 2)
+        
+        # Sort by weighted score (descending), breaking ties by file names like the Python path,
+        # converting to dicts only for the surviving rows
+        rows = rows[np.lexsort((rank[rows['id2']], rank[rows['id1']], -rows['score']))]
+        names = self._file_names
+        return [
+            {
+                'file1': names[file1_id],
+                'file2': names[file2_id],
+                'coupling_percent': coupling_percent,
+                'changes_together': coupled_count,
+                'file1_changes': file1_count,
+                'file2_changes': file2_count,
+                'weighted_score': weighted_score
+            }
+            for file1_id, file2_id, coupling_percent, coupled_count, file1_count, file2_count, weighted_score
+            in rows.tolist()
+        ]
+    
+    def coupling_matrix(self) -> Tuple["scipy.sparse.csr_matrix", List[str]]:
+        """
+        Return the last analysis as a symmetric sparse co-change matrix and its file names.
+        
+        Entry (i, j) counts the commits that changed both files; the diagonal holds each file's changes.
+        """
+        if np is None or scipy is None:
+            raise ImportError("coupling_matrix requires NumPy and SciPy")
+        if self._file_coupling is None:
+            raise RuntimeError("analyze_coupling must be run before coupling_matrix")
+        
+        id1, id2, together = self._file_coupling.arrays()
+        file_ids = np.fromiter(self._file_change_count.keys(), dtype=np.int64)
+        changes = np.fromiter(self._file_change_count.values(), dtype=np.int64)
+        rows = np.concatenate([id1, id2, file_ids])
+        cols = np.concatenate([id2, id1, file_ids])
+        data = np.concatenate([together, together, changes])
+        n_files = len(self._file_names)
+        return scipy.sparse.coo_matrix((data, (rows, cols)), shape=(n_files, n_files)).tocsr(), list(self._file_names)
     
     def cleanup(self):
         """Clean up temporary resources."""
         if self.temp_dir and os.path.exists(self.temp_dir):
-            subprocess.run(["rm", "-rf", self.temp_dir], check=True)
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
 
 
 def output_results(results: List[Dict], format_type: str, output_file: str = 'change_coupling_results.csv', top_n: int = 20):
@@ -251,12 +730,12 @@ def output_results(results: List[Dict], format_type: str, output_file: str = 'ch
     # Always save complete results to CSV file
     if results:
         try:
-            with open(output_file, 'w', newline='') as csvfile:
-                fieldnames = results[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for row in results:
-                    writer.writerow(row)
+            with open(output_file, 'w', newline='', buffering=1 << 20) as csvfile:
+                fieldnames = list(results[0])
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+                # Project the dicts to tuples in C and let writerows drive the loop
+                writer.writerows(map(operator.itemgetter(*fieldnames), results))
             print(f"Full results saved to {output_file}")
         except Exception as e:
             print(f"Error saving results to CSV: {str(e)}", file=sys.stderr)
@@ -273,11 +752,10 @@ def output_results(results: List[Dict], format_type: str, output_file: str = 'ch
             print("No results to output.")
             return
             
-        fieldnames = top_results[0].keys()
-        writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in top_results:
-            writer.writerow(row)
+        fieldnames = list(top_results[0])
+        writer = csv.writer(sys.stdout)
+        writer.writerow(fieldnames)
+        writer.writerows(map(operator.itemgetter(*fieldnames), top_results))
     
     else:  # text format
         if not top_results:
@@ -319,12 +797,28 @@ def main():
     parser.add_argument('--top', type=int, default=20,
                         help='Show top N results with highest coupling [default: 20]')
     parser.add_argument('--ignore-file', help='Path to file containing patterns of files to ignore')
+    parser.add_argument('--max-count', type=int,
+                        help='Only consider the N most recent commits within the period')
+    parser.add_argument('--first-parent', action='store_true',
+                        help='Only analyze commits made directly on the branch, skipping merged-in history')
+    parser.add_argument('--max-files-per-commit', type=int, default=50,
+                        help='Count no pairs for commits touching more than N source files, 0 for no limit [default: 50]')
+    parser.add_argument('--cache-dir', default='~/.cache/change_coupling',
+                        help='Directory for the parsed history cache [default: ~/.cache/change_coupling]')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always clone and parse the history, without reading or writing the cache')
+    parser.add_argument('--include-merges', action='store_true',
+                        help='Also analyze merge commits, diffed against their first parent')
+    parser.add_argument('--include-deletions', action='store_true',
+                        help='Also count changes that delete a file')
     
     args = parser.parse_args()
     
     try:
-        analyzer = GitChangeAnalyzer(args.repo, args.branch, args.since, args.ignore_file)
-        results = analyzer.analyze_coupling(args.coupling_threshold, args.min_changes)
+        analyzer = GitChangeAnalyzer(args.repo, args.branch, args.since, args.ignore_file, args.first_parent,
+                                     args.max_count, None if args.no_cache else args.cache_dir,
+                                     args.include_merges, args.include_deletions)
+        results = analyzer.analyze_coupling(args.coupling_threshold, args.min_changes, args.max_files_per_commit)
         output_results(results, args.output, args.output_file, args.top)
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
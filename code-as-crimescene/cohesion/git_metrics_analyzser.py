@@ -4,53 +4,69 @@ import subprocess
 import tempfile
 import os
 import shutil
+import sys
 from collections import defaultdict, Counter
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 import re
 import csv # For CSV output
+import heapq
+import queue
+import threading
+
+try:
+    from tqdm import tqdm
+except ImportError: # Progress falls back to a plain status line
+    tqdm = None
 
 # --- Configuration ---
 DEFAULT_FILE_EXTENSIONS = ['.py', '.js', '.java', '.c', '.cpp', '.h', '.rb', '.go', '.rs', '.swift', '.kt', '.kts', '.scala', '.php', '.ts']
 DEFAULT_TRUCK_FACTOR_ORPHAN_THRESHOLD = 0.5 # 50% of files orphaned
 DEFAULT_FRICTION_MIN_AUTHORS = 5 # Min authors for a file to be considered high friction
 DEFAULT_SINCE_DATE = "1 year ago" # For friction analysis primarily
+READ_AHEAD_CHUNKS = 1024 # 64 KiB chunks of git output buffered ahead of the parser
+DEFAULT_PROCS = min(os.cpu_count() or 1, 8) # More blame processes than this mostly contend for pack I/O and FDs
+BLAME_CHUNKSIZE = 16 # Files handed to a blame worker at a time, amortizing the pickling round trip
+
+# Email normalization: providers that ignore '+tags' in the local part, and gmail which also ignores dots
+EMAIL_PATTERN = re.compile(r"([^@]*)@(.*)", re.DOTALL)
+GMAIL_DOMAINS = frozenset({"gmail.com", "googlemail.com"})
+MICROSOFT_MAIL_DOMAINS = frozenset({"outlook.com", "hotmail.com", "live.com"})
+DROP_DOTS = str.maketrans('', '', '.')
 
 # --- Helper Functions ---
-def run_git_command(command, cwd, capture_output=True, check_sysexit_on_error=True):
+def run_git_command(command, cwd, capture_output=True, check_sysexit_on_error=True, binary=False):
     """
     Runs a git command.
     If capture_output is True, returns stdout as a string, decoded as UTF-8.
+    If binary is True, returns stdout as undecoded, unstripped bytes instead.
     If check_sysexit_on_error is True, will exit script on git command error.
     Otherwise, returns stdout (even on error) or empty string.
     """
     try:
         # print(f"DEBUG: Running: {' '.join(command)} in {cwd}") # For debugging
-        process = subprocess.run(
-            command,
-            cwd=cwd,
-            capture_output=capture_output,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
+        if binary:
+            process = subprocess.run(command, cwd=cwd, capture_output=capture_output)
+        else:
+            process = subprocess.run(
+                command,
+                cwd=cwd,
+                capture_output=capture_output,
+                text=True,
+                encoding='utf-8',
+                errors='replace'
+            )
 
         if process.returncode != 0:
-            error_message_parts = [
-                f"Git command failed: {' '.join(command)}",
-                f"Return Code: {process.returncode}"
-            ]
-            if capture_output and process.stderr:
-                error_message_parts.append(f"Stderr: {process.stderr.strip()}")
-            else:
-                 error_message_parts.append("Stderr: (not captured or empty)")
-            
-            error_message = "\n".join(error_message_parts)
-            print(f"Warning: {error_message}")
+            report_git_failure(command, process.returncode, process.stderr if capture_output else None)
 
             if check_sysexit_on_error:
                 print("Exiting due to git command error.")
                 exit(1)
         
+        if binary:
+            return process.stdout if capture_output and process.stdout else b""
         return process.stdout.strip() if capture_output and process.stdout else ""
 
     except FileNotFoundError:
@@ -61,19 +77,84 @@ def run_git_command(command, cwd, capture_output=True, check_sysexit_on_error=Tr
         if check_sysexit_on_error:
             print("Exiting due to unexpected error.")
             exit(1)
-        return ""
+        return b"" if binary else ""
+
+def report_git_failure(command, returncode, stderr):
+    """Prints a warning for a failed git command, with its stderr (str or bytes) if captured."""
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode('utf-8', 'replace')
+    error_message_parts = [
+        f"Git command failed: {' '.join(command)}",
+        f"Return Code: {returncode}"
+    ]
+    if stderr:
+        error_message_parts.append(f"Stderr: {stderr.strip()}")
+    else:
+         error_message_parts.append("Stderr: (not captured or empty)")
+    
+    error_message = "\n".join(error_message_parts)
+    print(f"Warning: {error_message}")
+
+def run_git_stream(command, cwd):
+    """
+    Starts a git command with its stdout and stderr piped as bytes, and returns the Popen.
+    The caller iterates process.stdout line by line, so the output is never held in memory at once.
+    """
+    try:
+        return subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=-1
+        )
+    except FileNotFoundError:
+        print("Error: git command not found. Please ensure git is installed and in your PATH.")
+        exit(1)
+
+def iter_read_ahead(stream):
+    """
+    Yields 64 KiB chunks of a binary stream, read by a background thread into a bounded queue.
+    Git keeps producing output while the caller parses, instead of stalling on a full pipe.
+    """
+    chunks = queue.Queue(maxsize=READ_AHEAD_CHUNKS)
+
+    def read_chunks():
+        try:
+            for chunk in iter(lambda: stream.read1(1 << 16), b''):
+                chunks.put(chunk)
+        finally:
+            chunks.put(None)
+
+    threading.Thread(target=read_chunks, daemon=True).start()
+    return iter(chunks.get, None)
+
+def iter_nul_fields(stream):
+    """Yields the NUL-terminated fields of a binary stream, reading it in 64 KiB chunks."""
+    partial = b''
+    for chunk in iter_read_ahead(stream):
+        fields = (partial + chunk).split(b'\x00')
+        # The last field is incomplete until the next chunk arrives
+        partial = fields.pop()
+        yield from fields
 
 def get_relevant_files(repo_path, extensions):
-    all_files_str = run_git_command(["git", "ls-files"], cwd=repo_path, check_sysexit_on_error=True)
+    # -z leaves paths unquoted, so names with newlines or non-ASCII characters come through intact
+    all_files = run_git_command(["git", "ls-files", "-z"], cwd=repo_path, check_sysexit_on_error=True, binary=True)
     relevant_files = []
-    if all_files_str:
-        normalized_extensions = [ext.lower() for ext in extensions]
-        for f_path_str in all_files_str.splitlines():
-            if Path(f_path_str).suffix.lower() in normalized_extensions:
-                relevant_files.append(f_path_str)
+    if all_files:
+        normalized_extensions = frozenset(ext.lower().encode('utf-8') for ext in extensions)
+        for f_path in all_files.split(b'\x00'):
+            if f_path and os.path.splitext(f_path)[1].lower() in normalized_extensions:
+                relevant_files.append(sys.intern(f_path.decode('utf-8', 'surrogateescape')))
     return relevant_files
 
+@lru_cache(maxsize=None) # The same few emails recur across every commit and blamed file
 def normalize_author_email(email_str):
+    # Interned, so the author sets and Counters of every file share one string per author
+    return sys.intern(_normalize_author_email(email_str))
+
+def _normalize_author_email(email_str):
     if not email_str or not isinstance(email_str, str):
         return "unknown@example.com"
     
@@ -87,47 +168,93 @@ def normalize_author_email(email_str):
         # If it doesn't match the digit+username pattern, return as is (after lower/strip)
         return email 
     
-    if '@' in email:
-        local_part, domain = email.split('@', 1)
-        if "gmail.com" in domain or "googlemail.com" in domain:
-            local_part = local_part.split('+', 1)[0].replace('.', '')
+    match = EMAIL_PATTERN.match(email)
+    if match:
+        local_part, domain = match.groups()
+        if domain in GMAIL_DOMAINS:
+            local_part = local_part.partition('+')[0].translate(DROP_DOTS)
             return f"{local_part}@{domain}"
-        elif "outlook.com" in domain or "hotmail.com" in domain or "live.com" in domain:
-            local_part = local_part.split('+', 1)[0]
+        elif domain in MICROSOFT_MAIL_DOMAINS:
+            local_part = local_part.partition('+')[0]
             return f"{local_part}@{domain}"
     return email
 
 # --- Organisational Friction Metrics ---
-def calculate_authors_per_file(repo_path, relevant_files, since_date):
+def calculate_authors_per_file(repo_path, relevant_files, since_date, follow_renames=False):
+    """
+    Collects the distinct authors of each relevant file from the commits since since_date.
+    Merges are skipped, as they repeat their branch's authorship. With follow_renames, commits made to a
+    file under an earlier name count towards its current name; otherwise rename detection is off entirely.
+    """
     authors_by_file = defaultdict(set)
     print(f"\nAnalyzing author contributions per file (since {since_date})...")
 
-    log_output = run_git_command(
-        ["git", "log", f"--since='{since_date}'", "--pretty=format:%H%x1E%ae", "--name-only"],
-        cwd=repo_path,
-        check_sysexit_on_error=False
-    )
-
-    if not log_output:
+    # With -z every field is NUL-terminated: a commit is its "hash\x1Eemail" header, then its paths (the
+    # first with a leading newline), then an empty field. Paths are matched as bytes and never decoded.
+    # --name-status instead gives a status field before each path, and before both paths of a rename.
+    relevant_paths = {f_path.encode('utf-8', 'surrogateescape'): f_path for f_path in relevant_files}
+    command = ["git", "log", f"--since={since_date}", "--no-merges", "-z", "--pretty=format:%H%x1E%ae%x00"]
+    if follow_renames:
+        command += ["--name-status", "-M"]
+    else:
+        command += ["--no-renames", "--name-only"]
+    process = run_git_stream(command, cwd=repo_path)
+    with process:
+        commit_count = 0
+        current_commit_author_email = None
+        last_author_email_bytes = None
+        expect_header = True
+        first_path = False
+        # Walking newest first, maps each earlier name of a renamed file to its current name
+        renamed_to = {}
+        entry_status = None
+        entry_paths = []
+        entry_paths_left = 0
+        for field in iter_nul_fields(process.stdout):
+            if not field:
+                expect_header = True
+            elif expect_header:
+                commit_count += 1
+                author_email_bytes = field.partition(b'\x1E')[2]
+                # Authors commit in bursts, so consecutive commits often repeat the previous email
+                if author_email_bytes != last_author_email_bytes:
+                    last_author_email_bytes = author_email_bytes
+                    author_email_raw = author_email_bytes.strip().decode('utf-8', 'replace')
+                    if '@' in author_email_raw:
+                        current_commit_author_email = normalize_author_email(author_email_raw)
+                    else:
+                        current_commit_author_email = None
+                expect_header = False
+                first_path = True
+                entry_paths_left = 0
+            else:
+                if first_path:
+                    field = field[1:]
+                    first_path = False
+                if follow_renames:
+                    if not entry_paths_left:
+                        entry_status = field[:1]
+                        entry_paths = []
+                        entry_paths_left = 2 if entry_status in (b'R', b'C') else 1
+                        continue
+                    entry_paths.append(field)
+                    entry_paths_left -= 1
+                    if entry_paths_left:
+                        continue
+                    field = renamed_to.get(entry_paths[-1], entry_paths[-1])
+                    if entry_status == b'R':
+                        renamed_to[entry_paths[0]] = field
+                if current_commit_author_email:
+                    f_path = relevant_paths.get(field)
+                    if f_path is not None:
+                        authors_by_file[f_path].add(current_commit_author_email)
+        stderr = process.stderr.read()
+
+    if process.returncode != 0:
+        report_git_failure(command, process.returncode, stderr)
+    if not commit_count:
         print(f"Warning: No git log output for authors per file (perhaps no commits since {since_date}, or an error occurred).")
         return {}
-
-    current_commit_author_email = None
-    
-    for line in log_output.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-
-        if '\x1E' in line:
-            parts = line.split('\x1E', 1)
-            if len(parts) == 2 and '@' in parts[1]:
-                current_commit_author_email = normalize_author_email(parts[1])
-            else:
-                current_commit_author_email = None
-        elif current_commit_author_email:
-            if line in relevant_files:
-                 authors_by_file[line].add(current_commit_author_email)
     return authors_by_file
 
 def display_organizational_friction(authors_per_file, min_authors_threshold):
@@ -153,51 +280,131 @@ def display_organizational_friction(authors_per_file, min_authors_threshold):
 # --- Truck Factor Metrics ---
 def get_line_authorship(repo_path, file_path):
     authorship = Counter()
-    blame_output = run_git_command(
-        ["git", "blame", "-w", "-e", "--", file_path],
-        cwd=repo_path,
-        check_sysexit_on_error=False
-    )
-    if not blame_output:
+    # --incremental reports each blamed range as "<sha> <orig line> <final line> <line count>", followed by
+    # the commit's header (including "author-mail <email>") the first time that commit appears, then a
+    # "filename" line closing the range. Unlike --line-porcelain it never repeats headers or file content.
+    command = ["git", "blame", "--incremental", "-w", "--", file_path]
+    process = run_git_stream(command, cwd=repo_path)
+    with process:
+        commit_emails = {}
+        blamed_ranges = []
+        range_header = None
+        for line_content in process.stdout:
+            if range_header is None:
+                range_header = line_content.split()
+            elif line_content.startswith(b'filename '):
+                commit_sha, _, final_line, num_lines = range_header
+                blamed_ranges.append((int(final_line), commit_sha, int(num_lines)))
+                range_header = None
+            elif line_content.startswith(b'author-mail '):
+                commit_emails[range_header[0]] = line_content[len(b'author-mail '):].strip().strip(b'<>')
+        stderr = process.stderr.read()
+
+    if process.returncode != 0:
+        report_git_failure(command, process.returncode, stderr)
         return None
 
-    email_pattern = re.compile(r"^\S+\s+\((.*?)\s+\d{4}-\d{2}-\d{2}")
-
-    for line_content in blame_output.splitlines():
-        match = email_pattern.match(line_content)
-        if match:
-            potential_email_info = match.group(1).strip()
-            email_extract_match = re.search(r'<([^>]+@[^>]+)>', potential_email_info)
-            author_email_raw = None
-            if email_extract_match:
-                author_email_raw = email_extract_match.group(1)
-            else:
-                parts = potential_email_info.split()
-                if parts and '@' in parts[-1]:
-                    author_email_raw = parts[-1]
-            
-            if author_email_raw:
-                author_email_normalized = normalize_author_email(author_email_raw)
-                if author_email_normalized and author_email_normalized != "unknown@example.com":
-                    authorship[author_email_normalized] += 1
-            
+    # Ranges arrive in discovery order; count in file order so authors keep their first-line order for ties
+    blamed_ranges.sort()
+    for _, commit_sha, num_lines in blamed_ranges:
+        # Only the email is decoded, never the blamed content
+        author_email_raw = commit_emails.get(commit_sha, b'').decode('utf-8', 'replace')
+        if '@' in author_email_raw:
+            author_email_normalized = normalize_author_email(author_email_raw)
+            if author_email_normalized and author_email_normalized != "unknown@example.com":
+                authorship[author_email_normalized] += num_lines
     return authorship if authorship else None
 
-def calculate_truck_factor(repo_path, relevant_files, orphan_threshold_percentage):
-    print("\nCalculating line authorship for Truck Factor (this may take a while for large repos)...")
+def calculate_line_authorship(repo_path, relevant_files, procs=DEFAULT_PROCS):
+    """
+    Blames every relevant file, spreading the git blame processes over procs workers.
+    Returns {file: Counter of lines per author} in relevant_files order, skipping files without authorship.
+    """
+    if procs > 1:
+        executor = ProcessPoolExecutor(max_workers=procs)
+        authorships = executor.map(get_line_authorship, repeat(repo_path), relevant_files, chunksize=BLAME_CHUNKSIZE)
+    else:
+        executor = None
+        authorships = map(get_line_authorship, repeat(repo_path), relevant_files)
+
+    file_authorship_map = {}
+    try:
+        results = zip(relevant_files, authorships)
+        if tqdm is not None:
+            results = tqdm(results, total=len(relevant_files), desc="  Blaming files", unit="file")
+        for i, (f_path, authorship) in enumerate(results):
+            if tqdm is None:
+                print(f"  Processing file {i+1}/{len(relevant_files)}: {f_path[:100]}{'...' if len(f_path)>100 else ''}", end='\r')
+            if authorship:
+                file_authorship_map[f_path] = authorship
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return file_authorship_map
+
+def calculate_added_lines_authorship(repo_path, relevant_files):
+    """
+    Approximates line ownership from a single git log pass, as git-fame does: each author is credited with
+    the lines they added to a file over its whole history, ignoring later removals and rewrites.
+    Returns {file: Counter of added lines per author} like calculate_line_authorship.
+    """
+    relevant_paths = {f_path.encode('utf-8', 'surrogateescape'): f_path for f_path in relevant_files}
+    pathspecs = sorted({f":(icase)*{os.path.splitext(f_path)[1]}" for f_path in relevant_files})
+    # Same -z framing as the friction log, with "added\tdeleted\tpath" numstat fields in place of paths
+    command = ["git", "log", "--no-merges", "--no-renames", "-z", "--numstat", "--pretty=format:%x1E%ae%x00", "--", *pathspecs]
+    process = run_git_stream(command, cwd=repo_path)
+    file_authorship_map = defaultdict(Counter)
+    with process:
+        current_commit_author_email = None
+        last_author_email_bytes = None
+        expect_header = True
+        first_entry = False
+        for field in iter_nul_fields(process.stdout):
+            if not field:
+                expect_header = True
+            elif expect_header:
+                author_email_bytes = field.partition(b'\x1E')[2]
+                if author_email_bytes != last_author_email_bytes:
+                    last_author_email_bytes = author_email_bytes
+                    author_email_raw = author_email_bytes.strip().decode('utf-8', 'replace')
+                    current_commit_author_email = None
+                    if '@' in author_email_raw:
+                        author_email_normalized = normalize_author_email(author_email_raw)
+                        if author_email_normalized != "unknown@example.com":
+                            current_commit_author_email = author_email_normalized
+                expect_header = False
+                first_entry = True
+            else:
+                if first_entry:
+                    field = field[1:]
+                    first_entry = False
+                if current_commit_author_email:
+                    added, _, rest = field.partition(b'\t')
+                    f_path = relevant_paths.get(rest.partition(b'\t')[2])
+                    # Binary files report "-" instead of line counts
+                    if f_path is not None and added.isdigit() and added != b'0':
+                        file_authorship_map[f_path][current_commit_author_email] += int(added)
+        stderr = process.stderr.read()
+
+    if process.returncode != 0:
+        report_git_failure(command, process.returncode, stderr)
+    return {f_path: file_authorship_map[f_path] for f_path in relevant_files if f_path in file_authorship_map}
+
+def calculate_truck_factor(repo_path, relevant_files, orphan_threshold_percentage, procs=DEFAULT_PROCS, ownership_mode="blame"):
     if not relevant_files:
-        print("No relevant files found to calculate truck factor.")
+        print("\nNo relevant files found to calculate truck factor.")
         return 0, []
 
-    file_authorship_map = {}
-    processed_files_count = 0
-    for i, f_path in enumerate(relevant_files):
-        print(f"  Processing file {i+1}/{len(relevant_files)}: {f_path[:100]}{'...' if len(f_path)>100 else ''}", end='\r')
-        authorship = get_line_authorship(repo_path, f_path)
-        if authorship:
-            file_authorship_map[f_path] = authorship
-            processed_files_count += 1
-    print(f"\nLine authorship processing complete. Successfully processed {processed_files_count}/{len(relevant_files)} files for blame.")
+    if ownership_mode == "fast":
+        print("\nApproximating line authorship for Truck Factor from lines added in git log...")
+        file_authorship_map = calculate_added_lines_authorship(repo_path, relevant_files)
+        processed_files_count = len(file_authorship_map)
+        print(f"Added-lines authorship complete. Found authorship for {processed_files_count}/{len(relevant_files)} files.")
+    else:
+        print("\nCalculating line authorship for Truck Factor (this may take a while for large repos)...")
+        file_authorship_map = calculate_line_authorship(repo_path, relevant_files, procs)
+        processed_files_count = len(file_authorship_map)
+        print(f"\nLine authorship processing complete. Successfully processed {processed_files_count}/{len(relevant_files)} files for blame.")
 
     if not file_authorship_map:
         print("No authorship data could be collected for any relevant files.")
@@ -210,7 +417,7 @@ def calculate_truck_factor(repo_path, relevant_files, orphan_threshold_percentag
     for f_path, authors_in_file in file_authorship_map.items():
         if not authors_in_file:
             continue
-        primary_owner = max(authors_in_file, key=authors_in_file.get)
+        primary_owner = authors_in_file.most_common(1)[0][0]
         file_primary_owners[f_path] = primary_owner
         author_owned_files_initial[primary_owner].add(f_path)
         all_involved_authors.update(authors_in_file.keys())
@@ -227,33 +434,23 @@ def calculate_truck_factor(repo_path, relevant_files, orphan_threshold_percentag
     orphaned_files_count = 0
     current_truck_factor = 0
 
-    active_author_owned_files = {
-        author: set(files) for author, files in author_owned_files_initial.items() if files
-    }
-    covered_files = set(file_primary_owners.keys())
+    # Every file has exactly one primary owner, so removing an author never changes how many
+    # still-covered files the others own: rank authors once by owned files, largest first,
+    # breaking ties by first appearance as the former stable sort did.
+    authors_by_coverage = [
+        (-len(files), order, author)
+        for order, (author, files) in enumerate(author_owned_files_initial.items()) if files
+    ]
+    heapq.heapify(authors_by_coverage)
 
     while (orphaned_files_count / num_total_files_with_owners) < orphan_threshold_percentage:
-        if not active_author_owned_files or not covered_files:
+        if not authors_by_coverage:
             break
 
-        author_to_remove = None
-        
-        sorted_authors_by_current_coverage = sorted(
-            active_author_owned_files.items(),
-            key=lambda item: len(item[1].intersection(covered_files)),
-            reverse=True
-        )
-        
-        if not sorted_authors_by_current_coverage or len(sorted_authors_by_current_coverage[0][1].intersection(covered_files)) == 0:
-            break
-            
-        author_to_remove, files_primarily_owned_by_selected = sorted_authors_by_current_coverage[0]
-        files_impacted_by_this_removal = files_primarily_owned_by_selected.intersection(covered_files)
+        _, _, author_to_remove = heapq.heappop(authors_by_coverage)
+        files_impacted_by_this_removal = author_owned_files_initial[author_to_remove]
         num_files_impacted_this_round = len(files_impacted_by_this_removal)
 
-        if num_files_impacted_this_round == 0:
-             break
-
         loc_impacted_this_round = 0
         for f_path in files_impacted_by_this_removal:
             loc_impacted_this_round += file_authorship_map.get(f_path, {}).get(author_to_remove, 0)
@@ -268,12 +465,7 @@ def calculate_truck_factor(repo_path, relevant_files, orphan_threshold_percentag
         print(f"  Truck Factor Developer #{current_truck_factor}: {author_to_remove} "
               f"(orphaning {num_files_impacted_this_round} files, impacting {loc_impacted_this_round} of their LoC in these files)")
 
-        for f_path_orphaned in files_impacted_by_this_removal:
-            if f_path_orphaned in covered_files:
-                covered_files.remove(f_path_orphaned)
-                orphaned_files_count += 1
-        
-        del active_author_owned_files[author_to_remove]
+        orphaned_files_count += num_files_impacted_this_round
         
         print(f"  Files orphaned so far: {orphaned_files_count}/{num_total_files_with_owners} ({(orphaned_files_count / num_total_files_with_owners):.2%})")
 
@@ -298,18 +490,14 @@ def write_truck_factor_csv(filepath, developer_details_list):
         return
 
     try:
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ["Order", "Developer Email", "Files Impacted at Removal", "LoC Authored in Impacted Files"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-            for i, dev_details in enumerate(developer_details_list):
-                writer.writerow({
-                    "Order": i + 1,
-                    "Developer Email": dev_details['email'],
-                    "Files Impacted at Removal": dev_details['files_impacted'],
-                    "LoC Authored in Impacted Files": dev_details['loc_impacted']
-                })
+        with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
+
+            writer.writerow(["Order", "Developer Email", "Files Impacted at Removal", "LoC Authored in Impacted Files"])
+            writer.writerows(
+                (i + 1, dev_details['email'], dev_details['files_impacted'], dev_details['loc_impacted'])
+                for i, dev_details in enumerate(developer_details_list)
+            )
         print(f"Truck Factor details successfully written to: {filepath}")
     except IOError as e:
         print(f"Error writing Truck Factor CSV to {filepath}: {e}")
@@ -334,6 +522,11 @@ def main():
         default=DEFAULT_SINCE_DATE,
         help="For friction analysis, consider commits since this date (e.g., '1 year ago', '2023-01-01')."
     )
+    parser.add_argument(
+        "--follow_renames",
+        action="store_true",
+        help="For friction analysis, credit commits made to a file under an earlier name to its current name (slower; rename detection is off by default)."
+    )
     parser.add_argument(
         "--friction_min_authors",
         type=int,
@@ -357,6 +550,18 @@ def main():
         metavar="FILEPATH",
         help="Optional filepath to save the detailed Truck Factor developer list as a CSV file."
     )
+    parser.add_argument(
+        "--ownership_mode",
+        choices=["blame", "fast"],
+        default="blame",
+        help="How line ownership is measured for the Truck Factor: 'blame' runs git blame on every file; 'fast' credits authors with the lines they added, from a single git log pass (an approximation, as used by git-fame)."
+    )
+    parser.add_argument(
+        "--procs",
+        type=int,
+        default=DEFAULT_PROCS,
+        help="Number of parallel git blame processes for the Truck Factor analysis (1 disables the process pool)."
+    )
     parser.add_argument(
         "--keep_repo",
         action="store_true",
@@ -368,6 +573,9 @@ def main():
     if not (0.0 < args.truck_factor_orphan_threshold <= 1.0):
         print("Error: --truck_factor_orphan_threshold must be between 0.0 (exclusive) and 1.0 (inclusive).")
         exit(1)
+    if args.procs < 1:
+        print("Error: --procs must be at least 1.")
+        exit(1)
 
     temp_dir = tempfile.mkdtemp(prefix="gitmetrics_")
     repo_name = args.repo_url.split('/')[-1]
@@ -399,6 +607,10 @@ def main():
             run_git_command(["git", "fetch", "--unshallow"], cwd=repo_path, capture_output=False, check_sysexit_on_error=False)
             run_git_command(["git", "fetch", "--all", "--tags", "--force"], cwd=repo_path, capture_output=False, check_sysexit_on_error=False)
 
+        # One-time index of the history: speeds up the commit walks of every git blame, and its
+        # changed-path Bloom filters speed up path-limited logs
+        run_git_command(["git", "commit-graph", "write", "--reachable", "--changed-paths"], cwd=repo_path, check_sysexit_on_error=False)
+
         if args.branch:
             current_branch_cmd = run_git_command(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=repo_path)
             if current_branch_cmd != args.branch:
@@ -412,10 +624,12 @@ def main():
             return
         print(f"Found {len(relevant_files)} relevant files for analysis.")
 
-        authors_per_file = calculate_authors_per_file(repo_path, relevant_files, args.since)
+        authors_per_file = calculate_authors_per_file(repo_path, frozenset(relevant_files), args.since, args.follow_renames)
         display_organizational_friction(authors_per_file, args.friction_min_authors)
 
-        truck_factor_val, tf_dev_details = calculate_truck_factor(repo_path, relevant_files, args.truck_factor_orphan_threshold)
+        truck_factor_val, tf_dev_details = calculate_truck_factor(
+            repo_path, relevant_files, args.truck_factor_orphan_threshold, args.procs, args.ownership_mode
+        )
         display_truck_factor(truck_factor_val, tf_dev_details)
 
         if args.truck_factor_csv_output:
@@ -27,10 +27,15 @@ Options:
 import os
 import sys
 import csv
+import hashlib
+import heapq
+import pickle
 import re
 import shutil
+import stat
 import tempfile
 import subprocess
+import threading
 from pathlib import Path
 from collections import defaultdict, Counter
 from datetime import datetime
@@ -38,9 +43,49 @@ import fnmatch
 from docopt import docopt
 import tabulate
 
+try:
+    import pandas as pd
+except ImportError:  # Aggregation falls back to plain Python
+    pd = None
+
+try:
+    import numpy as np
+except ImportError:  # Scores fall back to plain Python
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _score_kernel(lines, revisions, authors, scores):
+        """Multiply the three metrics of every file in parallel."""
+        for i in prange(len(scores)):
+            scores[i] = lines[i] * revisions[i] * authors[i]
+
+
+def _hotspot_order(lines, revisions, authors):
+    """Return the scores of the metric arrays and the indices that sort them by descending score."""
+    if njit is not None:
+        scores = np.empty(len(lines), dtype=np.int64)
+        _score_kernel(lines, revisions, authors, scores)
+    else:
+        scores = lines * revisions * authors
+    # A stable sort keeps equal scores in file order
+    return scores, np.argsort(-scores, kind='stable')
+
 
 __version__ = "1.0.0"
 
+# Blobs larger than this are read and counted in pieces of this size
+BLOB_CHUNK_SIZE = 1 << 20
+
+# Columns of the hotspot and full report CSV files
+REPORT_FIELDS = ['file', 'lines_of_code', 'revisions', 'authors', 'score']
+
 
 class HotspotDetector:
     def __init__(self, repo_url, branch="main", ignore_file="ignore-files.txt", output_file="hotspots.csv", 
@@ -50,11 +95,15 @@ class HotspotDetector:
         self.ignore_file = ignore_file
         self.output_file = output_file
         self.temp_dir = None
+        self.git_env = None
+        self.tracked_files = set()
         self.ignore_patterns = []
+        self._ignore_re = None
         self.auth_method = auth_method
         self.username = username
         self.ssh_key = ssh_key
         self.token = token
+        self.cache_dir = Path.home() / ".hotspot_cache"
         self.load_ignore_patterns()
         
     def load_ignore_patterns(self):
@@ -71,22 +120,45 @@ class HotspotDetector:
                     continue
                 self.ignore_patterns.append(line)
         
+        # Compile every pattern into one alternation, matched once per path
+        if self.ignore_patterns:
+            self._ignore_re = re.compile(
+                '|'.join(f"(?:{self._translate_pattern(pattern)})" for pattern in self.ignore_patterns)
+            )
         print(f"Loaded {len(self.ignore_patterns)} ignore patterns from {self.ignore_file}")
         
+    @staticmethod
+    def _translate_pattern(pattern):
+        """Translate an ignore pattern to a regex; ** spans any number of directories."""
+        # Standard glob patterns
+        if '**' not in pattern:
+            return fnmatch.translate(pattern)
+        
+        parts = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                parts.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                parts.append('[^/]')
+                i += 1
+            else:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+        return ''.join(parts)
+        
     def should_ignore(self, file_path):
         """Check if a file should be ignored based on the patterns."""
-        for pattern in self.ignore_patterns:
-            # Convert glob patterns to regex patterns
-            if pattern.startswith('**/'):
-                if fnmatch.fnmatch(file_path, pattern[3:]) or any(fnmatch.fnmatch(part, pattern[3:]) for part in file_path.split('/')):
-                    return True
-            elif '/**' in pattern:
-                prefix = pattern.split('/**')[0]
-                if file_path.startswith(prefix):
-                    return True
-            elif fnmatch.fnmatch(file_path, pattern):
-                return True
-        return False
+        if self._ignore_re is None:
+            return False
+        return self._ignore_re.fullmatch(file_path) is not None
         
     def prepare_git_env(self):
         """Prepare the Git environment based on authentication method."""
@@ -145,14 +217,18 @@ class HotspotDetector:
         
         # Prepare environment variables for authentication
         env = self.prepare_git_env()
+        # Large files stored in Git LFS are never needed, only their pointer files
+        env['GIT_LFS_SKIP_SMUDGE'] = '1'
+        # Later fetches of file contents need the same authentication
+        self.git_env = env
         
         try:
-            # For very small repositories, we don't need --depth=1
-            # This ensures we get all commits right away
-            clone_cmd = ["git", "clone", "--branch", self.branch, self.repo_url, self.temp_dir]
+            # A bare, blobless clone downloads the full commit and tree history but no file contents;
+            # the contents of the files at the tip of the branch are fetched when lines are counted
+            clone_cmd = ["git", "clone", "--bare", "--filter=blob:none", "--branch", self.branch, self.repo_url, self.temp_dir]
             
             # Print the exact command we're running (hiding credentials)
-            display_cmd = " ".join(["git", "clone", "--branch", self.branch, display_url, self.temp_dir])
+            display_cmd = " ".join(["git", "clone", "--bare", "--filter=blob:none", "--branch", self.branch, display_url, self.temp_dir])
             print(f"Running: {display_cmd}")
             
             result = subprocess.run(
@@ -162,43 +238,23 @@ class HotspotDetector:
             )
             print("Repository cloned successfully.")
             
-            # Debugging: List the contents of the cloned directory
-            print("Contents of the cloned repository:")
-            for root, dirs, files in os.walk(self.temp_dir):
-                # Skip .git internals when printing
-                if ".git" in root.split(os.sep)[1:]:
-                    continue
-                level = root.replace(self.temp_dir, '').count(os.sep)
-                indent = ' ' * 4 * level
-                print(f"{indent}{os.path.basename(root)}/")
-                sub_indent = ' ' * 4 * (level + 1)
-                for f in files:
-                    print(f"{sub_indent}{f}")
-            
-            # If repository is too small, --unshallow might fail, so we'll skip it
-            os.chdir(self.temp_dir)
-            
-            # Check if we need to unshallow
-            try:
-                is_shallow = subprocess.run(
-                    ["git", "rev-parse", "--is-shallow-repository"],
-                    capture_output=True, check=True
-                ).stdout.decode('utf-8').strip()
-                
-                if is_shallow == "true":
-                    print("Fetching full commit history (this might take a while for large repositories)...")
-                    subprocess.run(
-                        ["git", "fetch", "--unshallow", "origin", self.branch],
-                        check=True, capture_output=True, timeout=600,
-                        env=env
-                    )
-                    print("Commit history fetched successfully.")
-                else:
-                    print("Repository already has full history.")
-            except:
-                print("Repository appears to have full history already.")
-            
-            os.chdir("..")
+            # Debugging: List the files at the tip of the branch, as a bare clone has no working tree
+            if os.environ.get("HOTSPOT_VERBOSE"):
+                tree = subprocess.run(
+                    ["git", "ls-tree", "-r", "-t", "-z", "HEAD"],
+                    capture_output=True, cwd=self.temp_dir
+                ).stdout
+                listing = ["Contents of the cloned repository:", f"{os.path.basename(self.temp_dir)}/"]
+                for entry in tree.split(b'\0'):
+                    if not entry:
+                        continue
+                    meta, _, path = entry.partition(b'\t')
+                    path = path.decode('utf-8', errors='replace')
+                    indent = ' ' * 4 * (path.count('/') + 1)
+                    suffix = '/' if meta.split()[1] == b'tree' else ''
+                    listing.append(f"{indent}{path.rsplit('/', 1)[-1]}{suffix}")
+                # One write for the whole listing instead of one per file
+                print('\n'.join(listing))
             
         except subprocess.CalledProcessError as e:
             print(f"Error cloning repository: {e}")
@@ -228,254 +284,328 @@ class HotspotDetector:
             sys.exit(1)
             
     def get_file_revisions(self):
-        """Get the number of revisions for each file in the repository."""
-        # Store the original directory to return to it later
-        original_dir = os.getcwd()
+        """
+        Get the number of revisions and the authors of each file in the repository.
+        Returns (revisions per file, authors per file, whether git log succeeded).
+        """
+        print("Analyzing file revisions...")
         
-        try:
-            os.chdir(self.temp_dir)
-            
-            print("Analyzing file revisions...")
-            
-            # Debug: Check if we have any commits in the repo
-            try:
-                cmd_check = subprocess.run(
-                    ["git", "rev-list", "--count", "HEAD"],
-                    capture_output=True, check=True
-                )
-                commit_count = int(cmd_check.stdout.decode('utf-8').strip())
-                print(f"Found {commit_count} commits in repository.")
-                
-                if commit_count == 0:
-                    print("WARNING: Repository has no commits! Cannot analyze file revisions.")
-                    return defaultdict(int), defaultdict(set)
-                    
-                # Debug: Check the branch we're on
-                cmd_branch = subprocess.run(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    capture_output=True, check=True
-                )
-                current_branch = cmd_branch.stdout.decode('utf-8').strip()
-                print(f"Current branch is: {current_branch}")
-                
-                # Debug: List files in the repo
-                cmd_files = subprocess.run(
-                    ["git", "ls-files"],
-                    capture_output=True, check=True
-                )
-                git_files = cmd_files.stdout.decode('utf-8').strip().splitlines()
-                files_count = len(git_files)
-                print(f"Repository contains {files_count} tracked files.")
-                
-                # Create a set of valid filenames for filtering
-                valid_files = set(git_files)
-                
-                # Get revision count by file using git directly
-                print("Getting file revision counts directly from Git...")
-                cmd_revs = subprocess.run(
-                    ["git", "log", "--name-only", "--pretty=format:"],
-                    capture_output=True, check=True
-                )
-                
-                # Process the output to count revisions
-                files_with_revs = cmd_revs.stdout.decode('utf-8', errors='replace').strip().splitlines()
-                files_with_revs = [f for f in files_with_revs if f.strip()]  # Remove empty lines
-                
-                # Validate files against git ls-files output to filter out non-file entries
-                files_with_revs = [f for f in files_with_revs if f in valid_files or '/' in f or '\\' in f or '.' in f]
-                
-                # Count occurrences of each file
-                rev_counts = Counter(files_with_revs)
-                print(f"Direct count shows {len(rev_counts)} files with revisions:")
-                
-                # Print top 10 files by revision count
-                for file_path, count in rev_counts.most_common(10):
-                    print(f"  {file_path}: {count} revisions")
-                
-                # Get authors by file
-                print("Getting author information by file...")
-                cmd_authors = subprocess.run(
-                    ["git", "log", "--pretty=format:%an", "--name-only"],
-                    capture_output=True, check=True
-                )
-                
-                authors_output = cmd_authors.stdout.decode('utf-8', errors='replace').strip().splitlines()
-                
-                revisions = defaultdict(int)
-                authors = defaultdict(set)
-                current_author = None
-                in_files_section = False
-                
-                # Process the output to get authors for each file
-                for line in authors_output:
-                    if not line.strip():
-                        in_files_section = True
-                        continue
-                    
-                    if in_files_section:
-                        # Check if this is actually a file, not just a name
-                        if line in valid_files or '/' in line or '\\' in line or '.' in line:
-                            file_path = line.strip()
-                            if file_path and not self.should_ignore(file_path):
-                                revisions[file_path] += 1
-                                if current_author:
-                                    authors[file_path].add(current_author)
-                        else:
-                            # Not a file, must be a new author
-                            in_files_section = False
-                            current_author = line.strip()
-                    else:
-                        # Author name
-                        current_author = line.strip()
-                
-                # Override with the direct count for more accuracy
-                for file_path, count in rev_counts.items():
-                    if not self.should_ignore(file_path):
-                        revisions[file_path] = count
-                
-                # Filter out any author names that accidentally got treated as files
-                # by verifying against the valid_files set or known file patterns
-                filtered_revisions = {}
-                filtered_authors = {}
-                
-                for file_path in revisions:
-                    # Only include if it's a valid file path (contains path separators or extension)
-                    # or it's in the list of tracked files from git ls-files
-                    if (file_path in valid_files or '/' in file_path or '\\' in file_path or '.' in file_path):
-                        filtered_revisions[file_path] = revisions[file_path]
-                        filtered_authors[file_path] = authors[file_path]
-                
-                print(f"Found {len(filtered_revisions)} files with revisions after filtering.")
-                print(f"Found {len(set().union(*filtered_authors.values()) if filtered_authors else set())} unique authors.")
-                
-            except subprocess.CalledProcessError as e:
-                print(f"Error getting repository info: {e}")
-                if e.stderr:
-                    print(f"Git error: {e.stderr.decode('utf-8', errors='replace')}")
-                return defaultdict(int), defaultdict(set)
-            
-        finally:
-            # Always change back to the original directory
-            os.chdir(original_dir)
-            
-        return filtered_revisions, filtered_authors
+        # Flatten the history into parallel lists with one (file name, author) entry per change
+        names = []
+        name_authors = []
+        commit_count = 0
         
-    def count_lines(self, file_path):
-        """Count the number of lines in a file."""
-        try:
-            # Check if file exists and is not a directory or symlink
-            if not os.path.isfile(file_path) or os.path.islink(file_path):
-                return 0
-                
-            # Try to open as text file with various encodings
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
+        def add_record(record):
+            author, _, record_names = record.partition(b'\n')
+            record_names = [name for name in record_names.split(b'\0') if name]
+            names.extend(record_names)
+            name_authors.extend([author.decode('utf-8', errors='replace')] * len(record_names))
+        
+        # One pass over the history: each commit is "\x01<author>\n" followed by its NUL-terminated
+        # file names, so an author can never be mistaken for a file. The output is parsed while
+        # git is still writing it instead of being buffered whole. Rename detection is off because it
+        # would download file contents into the blobless clone; only paths present at HEAD are scored.
+        with subprocess.Popen(
+            ["git", "log", "-z", "--no-renames", "--name-only", "--pretty=format:%x01%an"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=1024 * 1024, cwd=self.temp_dir
+        ) as proc:
+            pending = []
+            while True:
+                chunk = proc.stdout.read(65536)
+                if not chunk:
+                    break
+                records = chunk.split(b'\x01')
+                if len(records) == 1:
+                    # The current record continues past this chunk
+                    pending.append(chunk)
+                    continue
+                pending.append(records[0])
+                records[0] = b''.join(pending)
+                # The last record may continue in the next chunk
+                pending = [records.pop()]
+                for record in records:
+                    if record:
+                        commit_count += 1
+                        add_record(record)
+            if b''.join(pending):
+                commit_count += 1
+                add_record(b''.join(pending))
+            stderr = proc.stderr.read()
+        
+        if proc.returncode != 0:
+            print(f"Error getting repository info: git log exited with status {proc.returncode}")
+            if stderr:
+                print(f"Git error: {stderr.decode('utf-8', errors='replace')}")
+            return defaultdict(int), defaultdict(set), False
+        
+        print(f"Found {commit_count} commits in repository.")
+        if not commit_count:
+            print("WARNING: Repository has no commits! Cannot analyze file revisions.")
+            return defaultdict(int), defaultdict(set), True
+        
+        # Both aggregations keep names in order of first appearance
+        if pd is not None:
+            changes = pd.DataFrame({'name': names, 'author': name_authors})
+            name_revisions = changes.groupby('name', sort=False).size().to_dict()
+            name_author_sets = changes.drop_duplicates().groupby('name', sort=False)['author'].agg(set).to_dict()
+        else:
+            name_revisions = Counter(names)
+            name_author_sets = defaultdict(set)
+            for name, author in zip(names, name_authors):
+                name_author_sets[name].add(author)
+        
+        # Decode and ignore-check each distinct name once
+        revisions = Counter()
+        authors = {}
+        for name, count in name_revisions.items():
+            file_path = name.decode('utf-8', errors='replace')
+            if self.should_ignore(file_path):
+                continue
+            revisions[file_path] += count
+            authors.setdefault(file_path, set()).update(name_author_sets[name])
+        
+        print(f"Found {len(revisions)} files with revisions:")
+        # Print top 10 files by revision count
+        for file_path, count in revisions.most_common(10):
+            print(f"  {file_path}: {count} revisions")
+        print(f"Found {len(set().union(*authors.values()) if authors else set())} unique authors.")
+        
+        return dict(revisions), authors, True
+        
+    def count_tracked_lines(self):
+        """
+        Count the lines of every file tracked at HEAD, reading all blobs through one `git cat-file --batch` process.
+        Returns (number of tracked entries, lines per text file, tracked non-ignored files, ignored count, unreadable count).
+        """
+        tree = subprocess.run(
+            ["git", "ls-tree", "-r", "-z", "HEAD"],
+            capture_output=True, check=True, cwd=self.temp_dir
+        ).stdout
+        entries = [entry for entry in tree.split(b'\0') if entry]
+        
+        loc = {}
+        tracked_files = []
+        ignored_count = 0
+        unreadable_count = 0
+        blobs = []
+        for entry in entries:
+            # Each entry is "<mode> <type> <sha>\t<path>"
+            meta, _, path = entry.partition(b'\t')
+            mode, obj_type, sha = meta.split()
+            file_path = path.decode('utf-8', errors='replace')
+            if self.should_ignore(file_path):
+                ignored_count += 1
+                continue
+            # Submodules are commits, not files
+            if obj_type != b'blob':
+                continue
+            tracked_files.append(file_path)
+            # Symlinks are tracked but have no lines of their own
+            if mode != b'120000':
+                blobs.append((file_path, sha))
+        
+        # Files whose contents could not be downloaded are skipped rather than failing every count
+        missing = self.prefetch_blobs(sha for _, sha in blobs)
+        for file_path, sha in blobs:
+            if sha in missing:
+                print(f"Warning: Could not read {file_path} from Git, skipping it")
+                unreadable_count += 1
+        blobs = [(file_path, sha) for file_path, sha in blobs if sha not in missing]
+        
+        with subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=self.git_env, cwd=self.temp_dir
+        ) as proc:
+            # Feed the object names from a thread so a full stdout pipe can never block the requests
+            def request_blobs():
                 try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        # Read a small chunk to check if it's text
-                        sample = f.read(1024)
-                        if '\0' in sample:  # Binary file
-                            return 0
-                        
-                        # If we got here, reset the file pointer and count lines
-                        f.seek(0)
-                        line_count = sum(1 for _ in f)
-                        return line_count
-                except UnicodeDecodeError:
+                    proc.stdin.writelines(sha + b'\n' for _, sha in blobs)
+                finally:
+                    proc.stdin.close()
+            
+            feeder = threading.Thread(target=request_blobs, daemon=True)
+            feeder.start()
+            for file_path, _ in blobs:
+                # Each reply is "<sha> <type> <size>\n", the content, then a newline,
+                # or "<sha> missing\n" for a blob that could not be fetched
+                header = proc.stdout.readline().split()
+                if not header:
+                    raise EOFError("git cat-file output ended early")
+                if header[-1] == b'missing':
+                    print(f"Warning: Could not read {file_path} from Git, skipping it")
+                    unreadable_count += 1
                     continue
-                except Exception as e:
-                    print(f"Warning: Error reading {file_path}: {e}")
-                    return 0
-                    
-            # If we've tried all encodings and none worked, it's probably binary
+                size = int(header[2])
+                lines = self._count_blob_lines(proc.stdout, size)
+                proc.stdout.read(1)
+                if lines > 0:
+                    loc[file_path] = lines
+            feeder.join()
+        
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        return len(entries), loc, tracked_files, ignored_count, unreadable_count
+        
+    @staticmethod
+    def _count_blob_lines(stream, size):
+        """
+        Count the lines of a blob of the given size read from the stream, or return 0 for an empty or binary blob.
+        Large blobs are counted one chunk at a time rather than copied into memory whole.
+        """
+        lines = 0
+        remaining = size
+        binary = False
+        chunk = b''
+        while remaining:
+            chunk = stream.read(min(remaining, BLOB_CHUNK_SIZE))
+            if not chunk:
+                raise EOFError("git cat-file output ended inside a blob")
+            if remaining == size and b'\0' in chunk[:1024]:  # Binary file
+                binary = True
+            if not binary:
+                lines += chunk.count(b'\n')
+            remaining -= len(chunk)
+        if binary or not size:
             return 0
+        # The last line may have no newline
+        return lines + (0 if chunk.endswith(b'\n') else 1)
+        
+    def prefetch_blobs(self, shas):
+        """
+        Download the given blobs in one request when the clone is partial.
+        Without this, `git cat-file` would fetch each missing blob from the remote on its own.
+        Returns the blobs at HEAD that are still missing afterwards.
+        """
+        is_partial = subprocess.run(
+            ["git", "config", "--get", "remote.origin.promisor"],
+            capture_output=True, cwd=self.temp_dir
+        ).stdout.strip() == b'true'
+        if not is_partial:
+            return set()
+        
+        print("Fetching the contents of the files at the tip of the branch...")
+        try:
+            subprocess.run(
+                ["git", "-c", "fetch.negotiationAlgorithm=noop", "fetch", "--no-tags", "--no-write-fetch-head",
+                 "--recurse-submodules=no", "--filter=blob:none", "--stdin", "origin"],
+                input=b''.join(sha + b'\n' for sha in shas),
+                check=True, capture_output=True, timeout=600,
+                env=self.git_env, cwd=self.temp_dir
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            print(f"Warning: Could not prefetch file contents: {e}")
+        
+        # Listing missing objects never fetches them; a blob that is still missing would make
+        # `git cat-file --batch` try a lazy fetch, which aborts the whole batch when it fails
+        listing = subprocess.run(
+            ["git", "rev-list", "--objects", "--missing=print", "--no-walk", "HEAD"],
+            capture_output=True, cwd=self.temp_dir
+        ).stdout
+        return {line[1:] for line in listing.splitlines() if line.startswith(b'?')}
+        
+    def calculate_lines_of_code(self):
+        """
+        Count the lines of every non-ignored file at the tip of the branch.
+        Returns (lines per text file, all tracked files, processed file count, ignored count, whether all files were read).
+        """
+        print("Calculating lines of code for each file...")
+        loc = {}
+        file_count = 0
+        ignored_count = 0
+        all_files = []
+        complete = False
+        
+        # Count lines of all files directly from Git's objects; a bare clone has no files on disk
+        try:
+            tracked_count, loc, all_files, ignored_count, unreadable_count = self.count_tracked_lines()
+            file_count = len(all_files)
+            
+            print(f"Git reports {tracked_count} tracked files in the repository.")
+            if unreadable_count:
+                print(f"Warning: {unreadable_count} files could not be read and have no line count.")
+            complete = not unreadable_count
         except Exception as e:
-            print(f"Warning: Error counting lines in {file_path}: {e}")
-            return 0
+            print(f"Error listing Git files: {e}")
+        
+        return loc, all_files, file_count, ignored_count, complete
+        
+    def get_head_sha(self):
+        """Return the commit the clone is checked out at, or None if it cannot be resolved."""
+        try:
+            return subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, cwd=self.temp_dir
+            ).strip().decode()
+        except subprocess.CalledProcessError:
+            return None
+            
+    def _cache_path(self, head_sha):
+        """Cache file for this repository, ignore patterns and commit."""
+        # Ignore patterns change the results, so they are part of the key
+        key = hashlib.sha256("\0".join([self.repo_url, *self.ignore_patterns]).encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{key}-{head_sha}.pkl"
+        
+    def cache_enabled(self, head_sha):
+        """Caching is skipped for unresolved commits and when HOTSPOT_DISABLE_CACHE=1."""
+        return head_sha is not None and os.environ.get("HOTSPOT_DISABLE_CACHE") != "1"
+        
+    def load_cache(self, head_sha):
+        """Load the metrics saved for this commit, or None if there are none."""
+        if not self.cache_enabled(head_sha):
+            return None
+        cache_path = self._cache_path(head_sha)
+        if not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                revisions, authors, loc, all_files, file_count, ignored_count = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read cache {cache_path}: {e}")
+            return None
+        print(f"Loaded file metrics for {head_sha[:12]} from cache {cache_path}")
+        authors = {file_path: set(names) for file_path, names in authors.items()}
+        return revisions, authors, loc, all_files, file_count, ignored_count
+        
+    def save_cache(self, head_sha, metrics):
+        """Save the metrics of this commit so the next run can skip the history scan."""
+        if not self.cache_enabled(head_sha):
+            return
+        revisions, authors, loc, all_files, file_count, ignored_count = metrics
+        authors = {file_path: list(names) for file_path, names in authors.items()}
+        cache_path = self._cache_path(head_sha)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump((revisions, authors, loc, all_files, file_count, ignored_count), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Warning: Could not write cache {cache_path}: {e}")
             
     def analyze(self):
         """Analyze the repository and calculate hotspots."""
         try:
             self.clone_repo()
             
-            print("Analyzing file revisions (this might take a while for large repos)...")
-            revisions, authors = self.get_file_revisions()
-            
-            # Even if no revisions, we'll continue to scan files to produce a basic report
-            if not revisions:
-                print("No file revisions found. Will still scan files to produce a basic report.")
+            head_sha = self.get_head_sha()
+            cached = self.load_cache(head_sha)
+            if cached is not None:
+                revisions, authors, loc, all_files, file_count, ignored_count = cached
             else:
-                print(f"Found {len(revisions)} files with revision history.")
-            
-            print("Calculating lines of code for each file...")
-            loc = {}
-            file_count = 0
-            ignored_count = 0
-            all_files = []
-            
-            # Get list of all files directly from Git
-            try:
-                os.chdir(self.temp_dir)
-                git_files_cmd = subprocess.run(
-                    ["git", "ls-files"],
-                    capture_output=True, check=True
-                )
-                git_files = git_files_cmd.stdout.decode('utf-8', errors='replace').strip().splitlines()
-                os.chdir("..")
-                
-                print(f"Git reports {len(git_files)} tracked files in the repository.")
+                print("Analyzing file revisions (this might take a while for large repos)...")
+                revisions, authors, revisions_complete = self.get_file_revisions()
                 
-                # Check each Git-tracked file
-                for git_file in git_files:
-                    # Skip ignored files
-                    if self.should_ignore(git_file):
-                        ignored_count += 1
-                        continue
-                    
-                    full_path = os.path.join(self.temp_dir, git_file.replace('/', os.sep))
-                    if os.path.exists(full_path) and os.path.isfile(full_path):
-                        lines = self.count_lines(full_path)
-                        if lines > 0:
-                            loc[git_file] = lines
-                        file_count += 1
-                        all_files.append(git_file)
-            except Exception as e:
-                print(f"Error listing Git files: {e}")
+                # Even if no revisions, we'll continue to scan files to produce a basic report
+                if not revisions:
+                    print("No file revisions found. Will still scan files to produce a basic report.")
+                else:
+                    print(f"Found {len(revisions)} files with revision history.")
                 
-                # Fallback to filesystem scan if Git listing fails
-                for root, _, files in os.walk(self.temp_dir):
-                    # Skip .git directory entirely
-                    if ".git" in root.split(os.sep):
-                        continue
-                        
-                    for file in files:
-                        full_path = os.path.join(root, file)
-                        # Use normpath to handle path separators consistently
-                        rel_path = os.path.normpath(os.path.relpath(full_path, self.temp_dir))
-                        # Convert Windows backslashes to forward slashes for consistency with Git
-                        rel_path = rel_path.replace('\\', '/')
-                        
-                        # Track all files
-                        all_files.append(rel_path)
-                        
-                        file_count += 1
-                        if self.should_ignore(rel_path):
-                            ignored_count += 1
-                            continue
-                        
-                        lines = self.count_lines(full_path)
-                        if lines > 0:
-                            loc[rel_path] = lines
+                loc, all_files, file_count, ignored_count, loc_complete = self.calculate_lines_of_code()
+                # A failed pass would otherwise be served from the cache until HEAD moves
+                if revisions_complete and loc_complete:
+                    self.save_cache(head_sha, (revisions, authors, loc, all_files, file_count, ignored_count))
             
-            # Scan revision files that might not have been found in filesystem
-            for file_path in revisions:
-                if file_path not in loc:
-                    full_path = os.path.join(self.temp_dir, file_path.replace('/', os.sep))
-                    if os.path.exists(full_path) and os.path.isfile(full_path):
-                        lines = self.count_lines(full_path)
-                        if lines > 0:
-                            loc[file_path] = lines
-                            if file_path not in all_files:
-                                all_files.append(file_path)
+            # The clone is deleted after the analysis, so remember which files it tracks for the full report
+            self.tracked_files = set(all_files)
             
             print(f"Processed {file_count} files, ignored {ignored_count} based on patterns.")
             print(f"Found {len(loc)} text files with line counts.")
@@ -484,37 +614,44 @@ class HotspotDetector:
             # Print summary of revisions for debug
             if revisions:
                 print("\nTop 5 files by revision count:")
-                for file_path, count in sorted(revisions.items(), key=lambda x: x[1], reverse=True)[:5]:
+                for file_path, count in heapq.nlargest(5, revisions.items(), key=lambda x: x[1]):
                     author_count = len(authors.get(file_path, set()))
                     line_count = loc.get(file_path, 0)
                     print(f"  {file_path}: {count} revisions, {author_count} authors, {line_count} lines")
             
             print("Calculating hotspot scores...")
-            hotspots = []
-            for file_path in revisions:
-                if file_path in loc and loc[file_path] > 0:
-                    score = loc[file_path] * revisions[file_path] * len(authors[file_path])
-                    hotspots.append({
-                        'file': file_path,
-                        'lines_of_code': loc[file_path],
-                        'revisions': revisions[file_path],
-                        'authors': len(authors[file_path]),
-                        'score': score
-                    })
-            
-            # Add files with line counts but no revision history
-            for file_path in loc:
-                if file_path not in revisions:
+            # Files with revisions and lines first, then files with lines but no revision history
+            files = [file_path for file_path in revisions if loc.get(file_path, 0) > 0]
+            files += [file_path for file_path in loc if file_path not in revisions]
+            
+            if np is not None:
+                lines = np.fromiter((loc[f] for f in files), dtype=np.int64, count=len(files))
+                revision_counts = np.fromiter((revisions.get(f, 0) for f in files), dtype=np.int64, count=len(files))
+                author_counts = np.fromiter((len(authors.get(f, ())) for f in files), dtype=np.int64, count=len(files))
+                scores, order = _hotspot_order(lines, revision_counts, author_counts)
+                hotspots = [{
+                    'file': files[i],
+                    'lines_of_code': int(lines[i]),
+                    'revisions': int(revision_counts[i]),
+                    'authors': int(author_counts[i]),
+                    'score': int(scores[i])
+                } for i in order.tolist()]
+            else:
+                hotspots = []
+                for file_path in files:
+                    # Files without revision history have no authors and score 0
+                    revision_count = revisions.get(file_path, 0)
+                    author_count = len(authors.get(file_path, ()))
                     hotspots.append({
                         'file': file_path,
                         'lines_of_code': loc[file_path],
-                        'revisions': 0,
-                        'authors': 0,
-                        'score': 0  # No score for files without revision history
+                        'revisions': revision_count,
+                        'authors': author_count,
+                        'score': loc[file_path] * revision_count * author_count
                     })
-            
-            # Sort by score in descending order
-            hotspots.sort(key=lambda x: x['score'], reverse=True)
+                
+                # Sort by score in descending order
+                hotspots.sort(key=lambda x: x['score'], reverse=True)
             
             print(f"Identified {len(hotspots)} files in report.")
             return hotspots, loc, revisions, authors
@@ -531,67 +668,76 @@ class HotspotDetector:
         """Save a full report of all files with metrics."""
         print(f"Generating full report to {full_report_path}...")
         
-        # Get the list of tracked git files to validate against
-        tracked_files_set = set()
-        try:
-            original_dir = os.getcwd()
-            os.chdir(self.temp_dir)
-            cmd_files = subprocess.run(
-                ["git", "ls-files"],
-                capture_output=True, check=True
-            )
-            tracked_files_set = set(cmd_files.stdout.decode('utf-8', errors='replace').strip().splitlines())
-            os.chdir(original_dir)
-        except Exception as e:
-            print(f"Warning: Could not get git file list: {e}")
-        
         # Collect all unique file paths that are in either revisions or loc
         all_files = set()
         for file_path in revisions:
             # Only include actual files from the repo
-            if file_path in tracked_files_set:
+            if file_path in self.tracked_files:
                 all_files.add(file_path)
         
         for file_path in loc:
             # Only include actual files from the repo
-            if file_path in tracked_files_set:
+            if file_path in self.tracked_files:
                 all_files.add(file_path)
         
         print(f"Preparing report with {len(all_files)} validated files.")
         
-        file_data = []
-        for file_path in all_files:
-            # Get metrics, defaulting to 0 if not present
-            line_count = loc.get(file_path, 0)
-            revision_count = revisions.get(file_path, 0)
-            author_count = len(authors.get(file_path, set()))
-            
-            # Calculate score if all metrics are available
-            if line_count > 0 and revision_count > 0 and author_count > 0:
-                score = line_count * revision_count * author_count
-            else:
-                score = 0
+        if pd is not None:
+            all_files = list(all_files)
+            file_data = pd.DataFrame({
+                'file': all_files,
+                'lines_of_code': [loc.get(file_path, 0) for file_path in all_files],
+                'revisions': [revisions.get(file_path, 0) for file_path in all_files],
+                'authors': [len(authors.get(file_path, ())) for file_path in all_files]
+            }, columns=REPORT_FIELDS[:-1])
+            # The score is 0 unless all metrics are available
+            file_data['score'] = file_data.lines_of_code * file_data.revisions * file_data.authors
+            # Sort by file path for easier browsing
+            file_data = file_data.sort_values('file')
+        else:
+            file_data = []
+            for file_path in all_files:
+                # Get metrics, defaulting to 0 if not present
+                line_count = loc.get(file_path, 0)
+                revision_count = revisions.get(file_path, 0)
+                author_count = len(authors.get(file_path, set()))
                 
-            file_data.append({
-                'file': file_path,
-                'lines_of_code': line_count,
-                'revisions': revision_count,
-                'authors': author_count,
-                'score': score
-            })
-            
-        # Sort by file path for easier browsing
-        file_data.sort(key=lambda x: x['file'])
+                # Calculate score if all metrics are available
+                if line_count > 0 and revision_count > 0 and author_count > 0:
+                    score = line_count * revision_count * author_count
+                else:
+                    score = 0
+                    
+                file_data.append({
+                    'file': file_path,
+                    'lines_of_code': line_count,
+                    'revisions': revision_count,
+                    'authors': author_count,
+                    'score': score
+                })
+                
+            # Sort by file path for easier browsing
+            file_data.sort(key=lambda x: x['file'])
         
-        # Write to CSV
-        with open(full_report_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['file', 'lines_of_code', 'revisions', 'authors', 'score'])
-            writer.writeheader()
-            for data in file_data:
-                writer.writerow(data)
+        self.write_csv(full_report_path, file_data)
                 
         print(f"Full report with {len(file_data)} files saved to {full_report_path}")
         
+    @staticmethod
+    def write_csv(path, rows):
+        """Write report rows, given as a DataFrame or a list of dicts, to a CSV file."""
+        if pd is not None:
+            if not isinstance(rows, pd.DataFrame):
+                rows = pd.DataFrame(rows, columns=REPORT_FIELDS)
+            # CRLF line endings, like the csv module writes
+            rows.to_csv(path, index=False, columns=REPORT_FIELDS, encoding='utf-8', lineterminator='\r\n')
+            return
+        
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        
     def save_results(self, hotspots, top_n=20, full_report_path=None, loc=None, revisions=None, authors=None):
         """Save the hotspot results to a CSV file."""
         try:
@@ -620,19 +766,13 @@ class HotspotDetector:
             if not hotspots:
                 print("No files found for analysis.")
                 # Create an empty CSV file with headers to avoid errors
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=['file', 'lines_of_code', 'revisions', 'authors', 'score'])
-                    writer.writeheader()
+                self.write_csv(output_file, [])
                 print(f"Created empty report file: {output_file}")
                 return
             
             print(f"Writing results to CSV file: {output_file}")
             try:
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=['file', 'lines_of_code', 'revisions', 'authors', 'score'])
-                    writer.writeheader()
-                    for hotspot in hotspots:
-                        writer.writerow(hotspot)
+                self.write_csv(output_file, hotspots)
                 
                 file_size = os.path.getsize(output_file)
                 print(f"Results saved to {output_file} ({file_size} bytes)")
@@ -641,11 +781,7 @@ class HotspotDetector:
                 print(f"Attempting to save to current directory...")
                 # Try saving to current directory with fixed filename
                 alt_output = os.path.join(os.getcwd(), "hotspots_report.csv")
-                with open(alt_output, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=['file', 'lines_of_code', 'revisions', 'authors', 'score'])
-                    writer.writeheader()
-                    for hotspot in hotspots:
-                        writer.writerow(hotspot)
+                self.write_csv(alt_output, hotspots)
                 print(f"Results saved to alternative file: {alt_output}")
             
             # Generate full report if requested
@@ -706,26 +842,22 @@ class HotspotDetector:
             import traceback
             traceback.print_exc()
             
+    @staticmethod
+    def _remove_readonly(func, path, _):
+        """Clear the read-only attribute on a path that failed to delete, then retry."""
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+        
     def cleanup(self):
         """Clean up temporary files."""
         if self.temp_dir and os.path.exists(self.temp_dir):
             print(f"Cleaning up temporary directory {self.temp_dir}...")
             try:
-                # Fix read-only attributes on Windows before removing
-                if os.name == 'nt':  # Windows
-                    for root, dirs, files in os.walk(self.temp_dir):
-                        for dir_name in dirs:
-                            try:
-                                os.chmod(os.path.join(root, dir_name), 0o777)
-                            except:
-                                pass
-                        for file_name in files:
-                            try:
-                                os.chmod(os.path.join(root, file_name), 0o777)
-                            except:
-                                pass
-                
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                # Only entries that fail to delete (read-only Git objects on Windows) get chmodded
+                if sys.version_info >= (3, 12):
+                    shutil.rmtree(self.temp_dir, onexc=self._remove_readonly)
+                else:
+                    shutil.rmtree(self.temp_dir, onerror=self._remove_readonly)
             except Exception as e:
                 print(f"Warning: Could not completely clean up temporary directory: {e}")
                 print("You may need to manually delete it later.")
@@ -815,14 +947,8 @@ def main():
             token
         )
         
-        # Make sure to return to the original directory after any directory changes
-        os.chdir(current_working_dir)
-        
         hotspots, loc, revisions, authors = detector.analyze()
         
-        # After analysis, reset to original directory again
-        os.chdir(current_working_dir)
-        
         # Always save results even if no hotspots found
         if not hotspots:
             print("No files found or analysis failed.")